@@ -0,0 +1,312 @@
+import mmap
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
+from math import ceil, inf
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from bellman_ford import NegativeCicleError, find_cycle
+from profiling import NULL_PROFILER, Profiler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DTYPES = {"float32": "f", "float64": "d"}
+
+# Worker side view of the graph and of the output buffer, set up once per
+# pool process by _init_worker
+_state = dict()
+
+
+class DistanceMatrix:
+    def __init__(
+        self, sources: Sequence[Hashable], targets: Sequence[Hashable], values
+    ) -> None:
+        self.sources = list(sources)
+        self.targets = list(targets)
+        self.values = values
+        self.shape = (len(self.sources), len(self.targets))
+
+    def row(self, idx: int) -> List[float]:
+        width = self.shape[1]
+        return list(self.values[idx * width : (idx + 1) * width])
+
+    def as_numpy(self):
+        if numpy is None:
+            raise ImportError("DistanceMatrix.as_numpy requires numpy")
+
+        return numpy.frombuffer(self.values, dtype=self.values.format).reshape(
+            self.shape
+        )
+
+    def __getitem__(self, cell: Tuple[int, int]) -> float:
+        return self.values[cell[0] * self.shape[1] + cell[1]]
+
+
+def distance_matrix(
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    weights: Optional[Sequence[float]],
+    rows: Sequence[int],
+    columns: Optional[Sequence[int]] = None,
+    workers: Optional[int] = None,
+    dtype: str = "float64",
+    filePath: Optional[str] = None,
+    negative: bool = False,
+    profiler: Profiler = NULL_PROFILER,
+) -> memoryview:
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype {dtype!r}, expected one of {tuple(DTYPES)}")
+
+    typecode = DTYPES[dtype]
+    width = len(columns) if columns is not None else len(offsets) - 1
+    cells = len(rows) * width
+    size = cells * array(typecode).itemsize
+    graph = {"offsets": offsets, "targets": targets}
+    if weights is not None:
+        graph["weights"] = weights
+    jobs = list(enumerate(rows))
+
+    if filePath is not None:
+        with open(filePath, "wb") as file:
+            file.truncate(size)
+        output = ("file", filePath, typecode, size)
+    else:
+        output = ("local", array(typecode, [0]) * cells)
+
+    # Serial runs keep their own state, so concurrent callers in one process
+    # never share the worker globals
+    if not workers or workers <= 1:
+        state = _worker_state(
+            {name: ("local", values) for name, values in graph.items()},
+            output,
+            columns,
+            negative,
+            profiler.enabled,
+        )
+        _count(profiler, _fill(state, jobs))
+        return state["output"]
+
+    blocks = []
+    try:
+        specs = {name: _share(values, blocks) for name, values in graph.items()}
+        if output[0] == "local":
+            output = _share(output[1], blocks)
+
+        chunk = max(1, ceil(len(jobs) / (workers * 4)))
+        with ProcessPoolExecutor(
+            workers,
+            initializer=_init_worker,
+            initargs=(specs, output, columns, negative, profiler.enabled),
+        ) as executor:
+            for counters in executor.map(
+                _fill_rows, [jobs[i : i + chunk] for i in range(0, len(jobs), chunk)]
+            ):
+                _count(profiler, counters)
+
+        if output[0] == "file":
+            return _attach(output, [])
+
+        values = array(typecode)
+        values.frombytes(blocks[-1].buf[:size])
+        return memoryview(values)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _share(values: Sequence, blocks: List[shared_memory.SharedMemory]) -> tuple:
+    values = memoryview(values)
+    block = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    block.buf[: values.nbytes] = values.cast("B")
+    blocks.append(block)
+
+    return ("shm", block.name, values.format, values.nbytes)
+
+
+def _attach(spec: tuple, handles: list) -> memoryview:
+    kind = spec[0]
+    if kind == "local":
+        return memoryview(spec[1])
+
+    _, name, typecode, size = spec
+    if kind == "shm":
+        block = shared_memory.SharedMemory(name=name)
+        handles.append(block)
+        return block.buf[:size].cast(typecode)
+
+    with open(name, "r+b") as file:
+        mapping = mmap.mmap(file.fileno(), size) if size else bytearray()
+    return memoryview(mapping).cast(typecode)
+
+
+def _worker_state(
+    graph: Dict[str, tuple],
+    output: tuple,
+    columns: Optional[Sequence[int]],
+    negative: bool,
+    profile: bool = False,
+) -> Dict:
+    handles = []
+    state = {name: _attach(spec, handles) for name, spec in graph.items()}
+    state["output"] = _attach(output, handles)
+    state["columns"] = columns
+    state["negative"] = negative
+    state["profile"] = profile
+    state["handles"] = handles
+
+    return state
+
+
+def _init_worker(
+    graph: Dict[str, tuple],
+    output: tuple,
+    columns: Optional[Sequence[int]],
+    negative: bool,
+    profile: bool = False,
+) -> None:
+    _state.update(_worker_state(graph, output, columns, negative, profile))
+
+
+def _fill_rows(jobs: List[Tuple[int, int]]) -> Dict[str, int]:
+    return _fill(_state, jobs)
+
+
+# Returns the chunk's counters, since a worker's profiler is not the caller's
+def _fill(state: Dict, jobs: List[Tuple[int, int]]) -> Dict[str, int]:
+    offsets, targets = state["offsets"], state["targets"]
+    weights = state.get("weights")
+    output, columns = state["output"], state["columns"]
+    width = len(columns) if columns is not None else len(offsets) - 1
+    profiler = Profiler() if state["profile"] else NULL_PROFILER
+
+    for row, source in jobs:
+        if weights is None:
+            distances = _bfs_row(offsets, targets, source, profiler)
+        elif state["negative"]:
+            distances = _spfa_row(offsets, targets, weights, source, profiler)
+        else:
+            distances = _dijkstra_row(offsets, targets, weights, source, profiler)
+
+        if columns is not None:
+            distances = [distances[column] for column in columns]
+        output[row * width : (row + 1) * width] = array(output.format, distances)
+
+    return profiler.as_dict()["counters"]
+
+
+def _count(profiler: Profiler, counters: Dict[str, int]) -> None:
+    for name, amount in counters.items():
+        profiler.count(name, amount)
+
+
+def _bfs_row(
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    source: int,
+    profiler: Profiler = NULL_PROFILER,
+) -> array:
+    distances = array("d", [inf]) * (len(offsets) - 1)
+    distances[source] = 0
+    queue = deque([source])
+    popped = scanned = 0
+
+    while queue:
+        node = queue.popleft()
+        start, end = offsets[node], offsets[node + 1]
+        popped += 1
+        scanned += end - start
+        for neighbor in targets[start:end]:
+            if distances[neighbor] == inf:
+                distances[neighbor] = distances[node] + 1
+                queue.append(neighbor)
+
+    profiler.count("vertices_popped", popped)
+    profiler.count("edges_scanned", scanned)
+    return distances
+
+
+def _dijkstra_row(
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    weights: Sequence[float],
+    source: int,
+    profiler: Profiler = NULL_PROFILER,
+) -> array:
+    distances = array("d", [inf]) * (len(offsets) - 1)
+    visited = bytearray(len(distances))
+    distances[source] = 0
+    heap = [(0, source)]
+    popped = scanned = relaxations = 0
+
+    while heap:
+        distance, node = heappop(heap)
+        if visited[node]:
+            continue
+        visited[node] = 1
+        popped += 1
+        scanned += offsets[node + 1] - offsets[node]
+
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[edge]
+            testing_value = round(distance + weights[edge], 1)
+            if testing_value < distances[neighbor]:
+                distances[neighbor] = testing_value
+                heappush(heap, (testing_value, neighbor))
+                relaxations += 1
+
+    profiler.count("vertices_popped", popped)
+    profiler.count("edges_scanned", scanned)
+    profiler.count("relaxations", relaxations)
+    profiler.count("heap_pushes", relaxations + 1)
+    return distances
+
+
+def _spfa_row(
+    offsets: Sequence[int],
+    targets: Sequence[int],
+    weights: Sequence[float],
+    source: int,
+    profiler: Profiler = NULL_PROFILER,
+) -> array:
+    vertices = len(offsets) - 1
+    distances = array("d", [inf]) * vertices
+    parent = [-1] * vertices
+    in_queue = bytearray(vertices)
+    enqueued = [0] * vertices
+    distances[source] = 0
+    queue = deque([source])
+    popped = scanned = relaxations = 0
+
+    try:
+        while queue:
+            node = queue.popleft()
+            in_queue[node] = 0
+            popped += 1
+            scanned += offsets[node + 1] - offsets[node]
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                testing_value = round(distances[node] + weights[edge], 1)
+                if testing_value < distances[neighbor]:
+                    distances[neighbor] = testing_value
+                    parent[neighbor] = node
+                    relaxations += 1
+
+                    if not in_queue[neighbor]:
+                        enqueued[neighbor] += 1
+                        if enqueued[neighbor] >= vertices:
+                            raise NegativeCicleError(find_cycle(parent, neighbor))
+                        in_queue[neighbor] = 1
+                        queue.append(neighbor)
+    finally:
+        profiler.count("vertices_popped", popped)
+        profiler.count("edges_scanned", scanned)
+        profiler.count("relaxations", relaxations)
+
+    return distances
@@ -0,0 +1,151 @@
+from collections import deque
+from sys import maxsize
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from profiling import NULL_PROFILER, Profiler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Both engines take 0-based vertices and return distances (maxsize when
+# unreachable) plus 1-based predecessors, like the rest of WeightedGraph
+
+
+class NegativeCicleError(Exception):
+    def __init__(self, cycle: Optional[List[int]] = None) -> None:
+        super().__init__(
+            f"Negative cycle through vertices {cycle}" if cycle else "Negative cycle"
+        )
+        self.cycle = cycle
+
+    def __reduce__(self):
+        return (type(self), (self.cycle,))
+
+
+def spfa(
+    adjacency: List[Dict[int, float]],
+    start: int,
+    profiler: Profiler = NULL_PROFILER,
+) -> Tuple[List[float], List[Optional[int]]]:
+    vertices = len(adjacency)
+    distances = [maxsize] * vertices
+    parent = [-1] * vertices
+    in_queue = bytearray(vertices)
+    enqueued = [0] * vertices
+    distances[start] = 0
+    in_queue[start] = 1
+    queue = deque([start])
+    popped = scanned = relaxations = 0
+
+    try:
+        while queue:
+            node = queue.popleft()
+            in_queue[node] = 0
+            distance = distances[node]
+            popped += 1
+            scanned += len(adjacency[node])
+
+            for neighbor, weight in adjacency[node].items():
+                testing_value = round(distance + weight, 1)
+                if testing_value < distances[neighbor]:
+                    distances[neighbor] = testing_value
+                    parent[neighbor] = node
+                    relaxations += 1
+
+                    if not in_queue[neighbor]:
+                        # A vertex can only improve V - 1 times without a cycle
+                        enqueued[neighbor] += 1
+                        if enqueued[neighbor] >= vertices:
+                            raise NegativeCicleError(find_cycle(parent, neighbor))
+
+                        in_queue[neighbor] = 1
+                        queue.append(neighbor)
+    finally:
+        profiler.count("vertices_popped", popped)
+        profiler.count("edges_scanned", scanned)
+        profiler.count("relaxations", relaxations)
+
+    return distances, [None if node == -1 else node + 1 for node in parent]
+
+
+def batch_bellman_ford(
+    sources: Sequence[int],
+    targets: Sequence[int],
+    weights: Sequence[float],
+    vertices: int,
+    start: int,
+) -> Tuple[List[float], List[Optional[int]]]:
+    if numpy is None:
+        raise ImportError("The numpy negative weight engine requires numpy")
+
+    sources = numpy.asarray(sources, dtype=numpy.int64)
+    targets = numpy.asarray(targets, dtype=numpy.int64)
+    weights = numpy.asarray(weights, dtype=numpy.float64)
+    distances = numpy.full(vertices, numpy.inf)
+    parent = numpy.full(vertices, -1, dtype=numpy.int64)
+    distances[start] = 0
+
+    # Every pass relaxes all edges at once; V - 1 passes always suffice, so
+    # an edge that still improves on pass V closes a negative cycle
+    for _ in range(vertices):
+        testing_values = numpy.round(distances[sources] + weights, 1)
+        improving = testing_values < distances[targets]
+        if not improving.any():
+            break
+
+        sources_in, targets_in = sources[improving], targets[improving]
+        testing_values = testing_values[improving]
+        numpy.minimum.at(distances, targets_in, testing_values)
+        winners = testing_values == distances[targets_in]
+        parent[targets_in[winners]] = sources_in[winners]
+    else:
+        parent = parent.tolist()
+        raise NegativeCicleError(find_cycle(parent, int(targets_in[0])))
+
+    return (
+        [
+            maxsize if distance == numpy.inf else float(distance)
+            for distance in distances
+        ],
+        [None if node == -1 else node + 1 for node in parent.tolist()],
+    )
+
+
+def find_cycle(parent: List[int], vertex: int) -> Optional[List[int]]:
+    # Walking back V steps from a vertex that keeps improving lands on the
+    # cycle; if the walk runs out, scan the whole predecessor graph instead
+    for _ in range(len(parent)):
+        if parent[vertex] == -1:
+            break
+        vertex = parent[vertex]
+    else:
+        return _cycle_from(parent, vertex)
+
+    state = bytearray(len(parent))
+    for start in range(len(parent)):
+        node = start
+        while node != -1 and not state[node]:
+            state[node] = 1
+            node = parent[node]
+        if node != -1 and state[node] == 1:
+            return _cycle_from(parent, node)
+
+        node = start
+        while node != -1 and state[node] == 1:
+            state[node] = 2
+            node = parent[node]
+
+    return None
+
+
+def _cycle_from(parent: List[int], vertex: int) -> List[int]:
+    cycle = [vertex]
+    node = parent[vertex]
+    while node != vertex:
+        cycle.append(node)
+        node = parent[node]
+
+    cycle.reverse()
+    return [node + 1 for node in cycle]
@@ -0,0 +1,173 @@
+import json
+import os
+import platform
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from math import isqrt
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bellman_ford import spfa
+from generators import barabasi_albert, erdos_renyi, grid, weighted, write_edge_list
+from graph import Graph
+from weighted_graph import WeightedGraph
+
+# Exact diameter runs one BFS per vertex, so bigger graphs only get ifub
+EXACT_DIAMETER_LIMIT = 5000
+
+
+def generate(kind: str, edges: int, seed: int) -> Tuple[int, Callable]:
+    if kind == "erdos_renyi":
+        vertices = max(2, edges // 4)
+        return vertices, lambda: erdos_renyi(vertices, edges, seed)
+    if kind == "barabasi_albert":
+        vertices = max(4, edges // 3)
+        return vertices, lambda: barabasi_albert(vertices, 3, seed)
+    if kind == "grid":
+        side = max(2, isqrt(edges // 2))
+        return side * side, lambda: grid(side, side, 0.01, seed)
+
+    raise ValueError(f"Unknown graph kind {kind!r}")
+
+
+def measure(step: Callable, memory: bool) -> Tuple[float, Optional[int]]:
+    if memory:
+        tracemalloc.start()
+
+    start = perf_counter()
+    step()
+    seconds = perf_counter() - start
+
+    if not memory:
+        return seconds, None
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def benchmark(kind: str, edges: int, seed: int = 0, memory: bool = False) -> List[Dict]:
+    results = []
+    vertices, edge_source = generate(kind, edges, seed)
+
+    with TemporaryDirectory() as workdir:
+        plain = os.path.join(workdir, "graph.txt")
+        weights = os.path.join(workdir, "weighted.txt")
+        write_edge_list(plain, vertices, edge_source())
+        write_edge_list(weights, vertices, weighted(edge_source(), seed=seed))
+
+        state = dict()
+
+        def load() -> None:
+            state["graph"] = Graph(plain)
+            state["source"] = next(iter(state["graph"].graph))
+
+        steps = [
+            ("load", load),
+            ("load_csr", lambda: state.update(csr=Graph(plain, backend="csr"))),
+            ("bfs", lambda: state["graph"].bfs(state["source"])),
+            ("dfs", lambda: state["graph"].dfs(state["source"])),
+            ("connected_components", lambda: state["graph"].connected_components()),
+            ("diameter_ifub", lambda: state["csr"].diameter("ifub")),
+            ("report", lambda: state["graph"].report()),
+            ("load_weighted", lambda: state.update(weighted=WeightedGraph(weights))),
+            ("dijkstra", lambda: state["weighted"].min_distances(1)),
+            ("bellman_ford", lambda: spfa(state["weighted"].adjacency, 0)),
+            ("mst_prim", lambda: state["weighted"].mst("prim", "mst.txt")),
+            ("mst_kruskal", lambda: state["weighted"].mst("kruskal", "mst.txt")),
+        ]
+        if vertices <= EXACT_DIAMETER_LIMIT:
+            steps.append(("diameter_exact", lambda: state["csr"].diameter()))
+
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name, step in steps:
+                seconds, peak = measure(step, memory)
+                results.append(
+                    {
+                        "graph": kind,
+                        "edges": edges,
+                        "vertices": vertices,
+                        "step": name,
+                        "seconds": round(seconds, 6),
+                        "peak_bytes": peak,
+                    }
+                )
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+
+def compare(old: Dict, new: Dict, threshold: float = 1.2) -> List[Dict]:
+    def key(result: Dict) -> Tuple:
+        return (result["graph"], result["edges"], result["step"])
+
+    before = {key(result): result for result in old["results"]}
+    regressions = []
+
+    for result in new["results"]:
+        previous = before.get(key(result))
+        if previous is None or not previous["seconds"]:
+            continue
+
+        ratio = result["seconds"] / previous["seconds"]
+        print(
+            f"{result['graph']:>16} {result['edges']:>9} {result['step']:>22} "
+            f"{previous['seconds']:>10.4f}s -> {result['seconds']:>10.4f}s "
+            f"x{ratio:.2f}"
+        )
+        if ratio > threshold:
+            regressions.append({**result, "previous_seconds": previous["seconds"]})
+
+    return regressions
+
+
+def main() -> int:
+    parser = ArgumentParser(
+        description="Time every graph algorithm on synthetic inputs"
+    )
+    parser.add_argument(
+        "--graphs", nargs="+", default=["erdos_renyi", "barabasi_albert", "grid"]
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="trace peak memory")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    results = []
+    for kind in args.graphs:
+        for size in args.sizes:
+            results.extend(benchmark(kind, size, args.seed, args.memory))
+
+    output = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "memory": args.memory,
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as file:
+        json.dump(output, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), output, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} step(s) slower than x{args.threshold}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+import mmap
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from csr import vertex_sort_key
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Positions of the set bits in every byte value, lowest first
+BYTE_BITS = [[bit for bit in range(8) if byte >> bit & 1] for byte in range(256)]
+
+# Eight cells per byte in the "0 1 0 " layout of the report
+BYTE_TEXT = ["".join(f"{byte >> bit & 1} " for bit in range(8)) for byte in range(256)]
+
+
+# Adjacency matrix with one bit per cell. Rows are padded to whole bytes with
+# the lowest bit first, so a row read as a little-endian int has bit j set when
+# j is a neighbor, and a whole BFS frontier expands with int ORs instead of a
+# loop per cell. Vertices are relabeled to 0..n-1 like CSRAdjacency, and with
+# a filePath the bits live in a memory-mapped file instead of a bytearray
+class BitMatrix:
+    def __init__(self, labels: Iterable[str], filePath: Optional[str] = None) -> None:
+        self.labels = list(labels)
+        self.index = {label: idx for idx, label in enumerate(self.labels)}
+        self.filePath = filePath
+        self.buffer = bytearray()
+        self.capacity = 0
+        self.stride = 0
+        self.__allocate(len(self.labels))
+
+    @classmethod
+    def from_mapping(
+        cls, graph: Mapping[str, Iterable[str]], filePath: Optional[str] = None
+    ) -> "BitMatrix":
+        matrix = cls(sorted(graph.keys(), key=vertex_sort_key), filePath)
+        index = matrix.index
+
+        for label in matrix.labels:
+            bits = 0
+            for edge in graph[label]:
+                bits |= 1 << index[edge]
+            start = index[label] * matrix.stride
+            matrix.buffer[start : start + matrix.stride] = bits.to_bytes(
+                matrix.stride, "little"
+            )
+
+        return matrix
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer)
+
+    def add(self, label: str) -> int:
+        idx = self.index.get(label)
+        if idx is None:
+            idx = len(self.labels)
+            if idx == self.capacity:
+                self.__allocate(max(8, 2 * self.capacity))
+            self.labels.append(label)
+            self.index[label] = idx
+
+        return idx
+
+    # The last vertex takes the removed one's index, so rows stay dense
+    def remove(self, label: str) -> None:
+        idx = self.index.pop(label)
+        last = len(self.labels) - 1
+
+        for neighbor in list(self.neighbors(idx)):
+            self.link(idx, neighbor, False)
+
+        if idx != last:
+            for neighbor in list(self.neighbors(last)):
+                self.link(last, neighbor, False)
+                self.link(idx, idx if neighbor == last else neighbor, True)
+            self.labels[idx] = self.labels[last]
+            self.index[self.labels[idx]] = idx
+
+        self.labels.pop()
+
+    def set(self, row: int, column: int, value: bool = True) -> None:
+        position = row * self.stride + (column >> 3)
+        if value:
+            self.buffer[position] |= 1 << (column & 7)
+        else:
+            self.buffer[position] &= ~(1 << (column & 7)) & 0xFF
+
+    def link(self, vert1: int, vert2: int, linked: bool = True) -> None:
+        self.set(vert1, vert2, linked)
+        self.set(vert2, vert1, linked)
+
+    def row(self, vertex: int) -> int:
+        start = vertex * self.stride
+        return int.from_bytes(self.buffer[start : start + self.stride], "little")
+
+    def row_text(self, vertex: int) -> str:
+        start = vertex * self.stride
+        text = "".join(
+            [BYTE_TEXT[byte] for byte in self.buffer[start : start + self.stride]]
+        )
+        return text[: 2 * len(self.labels)]
+
+    def neighbors(self, vertex: int) -> List[int]:
+        start = vertex * self.stride
+        return self.__members(self.buffer[start : start + self.stride])
+
+    def iter_levels(
+        self, start: int, max_depth: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[int]]]:
+        for depth, frontier in self.__frontiers(start, max_depth):
+            yield depth, self.__members(frontier.to_bytes(self.stride, "little"))
+
+    def components(self) -> List[List[int]]:
+        unseen = (1 << len(self.labels)) - 1
+        components = []
+
+        while unseen:
+            start = (unseen & -unseen).bit_length() - 1
+            reached = 0
+            for _, frontier in self.__frontiers(start):
+                reached |= frontier
+
+            components.append(self.__members(reached.to_bytes(self.stride, "little")))
+            unseen &= ~reached
+
+        return components
+
+    def as_numpy(self):
+        if numpy is None:
+            raise ImportError("BitMatrix.as_numpy requires numpy")
+
+        packed = numpy.frombuffer(self.buffer, dtype=numpy.uint8)
+        packed = packed[: len(self.labels) * self.stride].reshape(-1, self.stride)
+        return numpy.unpackbits(
+            packed, axis=1, count=len(self.labels), bitorder="little"
+        )
+
+    def flush(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.flush()
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __frontiers(
+        self, start: int, max_depth: Optional[int] = None
+    ) -> Iterator[Tuple[int, int]]:
+        visited = frontier = 1 << start
+        depth = 0
+
+        while frontier:
+            yield depth, frontier
+            if max_depth is not None and depth >= max_depth:
+                return
+
+            reached = 0
+            for vertex in self.__members(frontier.to_bytes(self.stride, "little")):
+                reached |= self.row(vertex)
+            frontier = reached & ~visited
+            visited |= frontier
+            depth += 1
+
+    def __members(self, packed: bytes) -> List[int]:
+        members = []
+        for idx, byte in enumerate(packed):
+            if byte:
+                base = idx << 3
+                members.extend([base + bit for bit in BYTE_BITS[byte]])
+
+        return members
+
+    # Growing changes the row stride, so every row is copied to its new place
+    def __allocate(self, capacity: int) -> None:
+        old, old_stride = bytes(self.buffer), self.stride
+        stride = (capacity + 7) >> 3
+        size = capacity * stride
+
+        if self.filePath is None:
+            buffer = bytearray(size)
+        else:
+            self.close()
+            with open(self.filePath, "w+b") as file:
+                file.truncate(max(1, size))
+                buffer = mmap.mmap(file.fileno(), max(1, size))
+
+        if old_stride:
+            for row in range(len(self.labels)):
+                start = row * stride
+                buffer[start : start + old_stride] = old[
+                    row * old_stride : (row + 1) * old_stride
+                ]
+
+        self.buffer, self.capacity, self.stride = buffer, capacity, stride
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.index
+
+    def __getitem__(self, cell: Tuple[int, int]) -> int:
+        row, column = cell
+        return self.buffer[row * self.stride + (column >> 3)] >> (column & 7) & 1
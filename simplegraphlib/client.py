@@ -0,0 +1,59 @@
+import json
+import socket
+from typing import Any, Optional
+
+
+class QueryError(Exception):
+    def __init__(self, type: str, message: str) -> None:
+        super().__init__(f"{type}: {message}")
+        self.type = type
+
+
+# Blocking client for server.py, one request at a time over a single
+# connection, so a short-lived process pays for a connect instead of a load
+class GraphClient:
+    def __init__(
+        self,
+        filePath: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if filePath is not None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.settimeout(timeout)
+            self.socket.connect(filePath)
+        else:
+            self.socket = socket.create_connection((host, port), timeout)
+
+        self.file = self.socket.makefile("rwb")
+        self.__next_id = 0
+
+    def call(self, graph: str, method: str, **params) -> Any:
+        self.__next_id += 1
+        request = {"id": self.__next_id, "graph": graph, "method": method}
+        if params:
+            request["params"] = params
+
+        self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("Graph server closed the connection")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise QueryError(response["error"]["type"], response["error"]["message"])
+
+        return response["result"]
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self) -> "GraphClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,5 @@
+import sys
+from os import path
+
+# The modules import each other by bare name, as when run from this folder
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
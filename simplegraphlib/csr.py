@@ -0,0 +1,157 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+
+def id_typecode(vertices: int) -> str:
+    return "i" if vertices < 2 ** 31 else "q"
+
+
+def vertex_sort_key(label: str):
+    # Numeric labels sort by value, anything else falls back to plain text
+    try:
+        return (0, int(label), "")
+    except ValueError:
+        return (1, 0, label)
+
+
+# Read-only adjacency with vertices relabeled to dense ints 0..n-1, in label
+# order, so neighbor lists come out pre-sorted and traversals avoid hashing
+class CSRAdjacency:
+    def __init__(
+        self, labels: List[str], offsets: Iterable[int], neighbors: Iterable[int]
+    ) -> None:
+        self.labels = labels
+        self.index = {label: idx for idx, label in enumerate(labels)}
+        self.offsets = offsets
+        self.neighbors_array = neighbors
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> "CSRAdjacency":
+        index: Dict[str, int] = {}
+        sources = array("q")
+        targets = array("q")
+
+        for vert1, vert2 in edges:
+            sources.append(index.setdefault(vert1, len(index)))
+            targets.append(index.setdefault(vert2, len(index)))
+
+        labels = sorted(index, key=vertex_sort_key)
+        relabel = array("q", [0]) * len(labels)
+        for new_id, label in enumerate(labels):
+            relabel[index[label]] = new_id
+        del index
+
+        return cls.__build(labels, sources, targets, relabel)
+
+    @classmethod
+    def from_mapping(cls, graph: Mapping[str, Iterable[str]]) -> "CSRAdjacency":
+        labels = sorted(graph.keys(), key=vertex_sort_key)
+        index = {label: idx for idx, label in enumerate(labels)}
+        offsets = array("q", [0])
+        neighbors = array(id_typecode(len(labels)))
+
+        for label in labels:
+            neighbors.extend(sorted(index[edge] for edge in graph[label]))
+            offsets.append(len(neighbors))
+
+        return cls(labels, offsets, neighbors)
+
+    @classmethod
+    def __build(
+        cls, labels: List[str], sources: array, targets: array, relabel: array
+    ) -> "CSRAdjacency":
+        vertices = len(labels)
+        offsets = array("q", [0]) * (vertices + 1)
+
+        for i in range(len(sources)):
+            sources[i] = relabel[sources[i]]
+            targets[i] = relabel[targets[i]]
+            offsets[sources[i] + 1] += 1
+            if sources[i] != targets[i]:
+                offsets[targets[i] + 1] += 1
+
+        for vertex in range(vertices):
+            offsets[vertex + 1] += offsets[vertex]
+
+        fill = array("q", offsets[:-1])
+        neighbors = array(id_typecode(vertices), [0]) * offsets[-1]
+
+        for source, target in zip(sources, targets):
+            neighbors[fill[source]] = target
+            fill[source] += 1
+            if source != target:
+                neighbors[fill[target]] = source
+                fill[target] += 1
+        del fill, sources, targets
+
+        # Sort every row and drop repeated edges, compacting in place
+        write = 0
+        for vertex in range(vertices):
+            row = sorted(set(neighbors[offsets[vertex] : offsets[vertex + 1]]))
+            offsets[vertex] = write
+            neighbors[write : write + len(row)] = array(neighbors.typecode, row)
+            write += len(row)
+        offsets[vertices] = write
+        del neighbors[write:]
+
+        return cls(labels, offsets, neighbors)
+
+    def neighbors(self, vertex: int) -> Iterable[int]:
+        return self.neighbors_array[self.offsets[vertex] : self.offsets[vertex + 1]]
+
+    def degree(self, vertex: int) -> int:
+        return self.offsets[vertex + 1] - self.offsets[vertex]
+
+    def degrees(self) -> Iterator[int]:
+        return (self.degree(vertex) for vertex in range(len(self.labels)))
+
+    def components(self) -> List[List[int]]:
+        visited = bytearray(len(self.labels))
+        components = []
+
+        for vertex in range(len(self.labels)):
+            if not visited[vertex]:
+                visited[vertex] = 1
+                component = [vertex]
+                stack = [vertex]
+                while stack:
+                    for neighbor in self.neighbors(stack.pop()):
+                        if not visited[neighbor]:
+                            visited[neighbor] = 1
+                            component.append(neighbor)
+                            stack.append(neighbor)
+                components.append(component)
+
+        return components
+
+    def keys(self) -> List[str]:
+        return self.labels
+
+    def values(self) -> Iterator[List[str]]:
+        return (self[label] for label in self.labels)
+
+    def items(self) -> Iterator[Tuple[str, List[str]]]:
+        labels = self.labels
+        return (
+            (label, [labels[edge] for edge in self.neighbors(idx)])
+            for idx, label in enumerate(labels)
+        )
+
+    def get(self, label: str, default: Optional[Set[str]] = None) -> Optional[Set[str]]:
+        return self[label] if label in self.index else default
+
+    def __getitem__(self, label: str) -> Set[str]:
+        idx = self.index.get(label)
+        if idx is None:
+            return set()
+
+        return {self.labels[edge] for edge in self.neighbors(idx)}
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.labels)
@@ -0,0 +1,100 @@
+from typing import Iterable, List, Union
+
+
+# Number of vertices per degree, with a Fenwick tree over the counts so that
+# min, max and median are order statistics found in O(log D) after each update
+class DegreeHistogram:
+    def __init__(self, degrees: Iterable[int] = ()) -> None:
+        self.counts: List[int] = []
+        self.count = 0
+        self.total = 0
+
+        for degree in degrees:
+            if degree >= len(self.counts):
+                self.counts.extend([0] * (degree + 1 - len(self.counts)))
+            self.counts[degree] += 1
+            self.count += 1
+            self.total += degree
+
+        self.__build(len(self.counts))
+
+    def add(self, degree: int, amount: int = 1) -> None:
+        if degree >= self.__capacity:
+            self.__build(degree + 1)
+
+        self.counts[degree] += amount
+        self.count += amount
+        self.total += degree * amount
+        self.__update(degree, amount)
+
+    def remove(self, degree: int, amount: int = 1) -> None:
+        if degree >= len(self.counts) or self.counts[degree] < amount:
+            raise ValueError(f"No vertex of degree {degree} to remove")
+
+        self.add(degree, -amount)
+
+    def move(self, old: int, new: int) -> None:
+        self.remove(old)
+        self.add(new)
+
+    @property
+    def min(self) -> int:
+        return self.__select(1) if self.count else 0
+
+    @property
+    def max(self) -> int:
+        return self.__select(self.count) if self.count else 0
+
+    @property
+    def mean(self) -> Union[int, float]:
+        if not self.count:
+            return 0
+        # Same types as statistics.mean over ints
+        if self.total % self.count == 0:
+            return self.total // self.count
+        return self.total / self.count
+
+    @property
+    def median(self) -> Union[int, float]:
+        if not self.count:
+            return 0
+        if self.count % 2:
+            return self.__select(self.count // 2 + 1)
+        return (self.__select(self.count // 2) + self.__select(self.count // 2 + 1)) / 2
+
+    def __build(self, size: int) -> None:
+        capacity = 1
+        while capacity < size:
+            capacity <<= 1
+
+        self.__capacity = capacity
+        self.counts.extend([0] * (capacity - len(self.counts)))
+        self.__tree = [0] + self.counts
+        for idx in range(1, capacity + 1):
+            parent = idx + (idx & -idx)
+            if parent <= capacity:
+                self.__tree[parent] += self.__tree[idx]
+
+    def __update(self, degree: int, amount: int) -> None:
+        idx = degree + 1
+        while idx <= self.__capacity:
+            self.__tree[idx] += amount
+            idx += idx & -idx
+
+    # Smallest degree with at least rank vertices at or below it
+    def __select(self, rank: int) -> int:
+        position = 0
+        step = self.__capacity
+        while step:
+            if (
+                position + step <= self.__capacity
+                and self.__tree[position + step] < rank
+            ):
+                position += step
+                rank -= self.__tree[position]
+            step >>= 1
+
+        return position
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,136 @@
+from array import array
+from collections import Counter, deque
+from random import Random
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from csr import CSRAdjacency
+from profiling import NULL_PROFILER, Profiler
+
+# All distances in this module are counted in edges (hops)
+
+
+# Graph.diameter counts the vertices on the path instead, one more than this
+class DiameterEstimate(NamedTuple):
+    lower_bound_hops: int
+    average_path_length: float
+    eccentricities: Dict[int, int]
+    sources: int
+
+
+def bfs_distances(
+    graph: CSRAdjacency, source: int, profiler: Profiler = NULL_PROFILER
+) -> Tuple[array, List[int]]:
+    distances = array("i", [-1]) * len(graph)
+    distances[source] = 0
+    order = [source]
+    queue = deque(order)
+    scanned = 0
+
+    while queue:
+        node = queue.popleft()
+        next_distance = distances[node] + 1
+        edges = graph.neighbors(node)
+        scanned += len(edges)
+        for neighbor in edges:
+            if distances[neighbor] == -1:
+                distances[neighbor] = next_distance
+                order.append(neighbor)
+                queue.append(neighbor)
+
+    profiler.count("vertices_popped", len(order))
+    profiler.count("edges_scanned", scanned)
+    profiler.count("bfs_runs")
+    return distances, order
+
+
+def eccentricity(
+    graph: CSRAdjacency, source: int, profiler: Profiler = NULL_PROFILER
+) -> int:
+    distances, order = bfs_distances(graph, source, profiler)
+    return distances[order[-1]]
+
+
+def exact_diameter(graph: CSRAdjacency, profiler: Profiler = NULL_PROFILER) -> int:
+    return max(
+        (eccentricity(graph, vertex, profiler) for vertex in range(len(graph))),
+        default=0,
+    )
+
+
+def ifub_diameter(graph: CSRAdjacency, profiler: Profiler = NULL_PROFILER) -> int:
+    diameter = 0
+
+    for component in graph.components():
+        if len(component) > 1:
+            diameter = max(diameter, _component_ifub(graph, component, profiler))
+
+    return diameter
+
+
+def _component_ifub(
+    graph: CSRAdjacency, component: List[int], profiler: Profiler
+) -> int:
+    # Double sweep from the highest degree vertex gives a lower bound and a
+    # long path whose middle vertex is a good center for the fringe search
+    start = max(component, key=graph.degree)
+    distances, order = bfs_distances(graph, start, profiler)
+    far = order[-1]
+    distances, order = bfs_distances(graph, far, profiler)
+    other_end = order[-1]
+    lower_bound = distances[other_end]
+
+    middle = other_end
+    for _ in range(lower_bound // 2):
+        middle = next(
+            neighbor
+            for neighbor in graph.neighbors(middle)
+            if distances[neighbor] == distances[middle] - 1
+        )
+
+    distances, order = bfs_distances(graph, middle, profiler)
+    level = distances[order[-1]]
+    lower_bound = max(lower_bound, level)
+    fringe_end = len(order)
+
+    while level > 0:
+        fringe_start = fringe_end
+        while fringe_start > 0 and distances[order[fringe_start - 1]] == level:
+            fringe_start -= 1
+
+        for vertex in order[fringe_start:fringe_end]:
+            lower_bound = max(lower_bound, eccentricity(graph, vertex, profiler))
+
+        # Anything deeper than here is at most 2 * (level - 1) apart
+        if lower_bound > 2 * (level - 1):
+            return lower_bound
+
+        fringe_end = fringe_start
+        level -= 1
+
+    return lower_bound
+
+
+def sample_diameter(
+    graph: CSRAdjacency,
+    samples: int,
+    seed: Optional[int] = None,
+    profiler: Profiler = NULL_PROFILER,
+) -> DiameterEstimate:
+    vertices = range(len(graph))
+    sources = Random(seed).sample(vertices, min(samples, len(vertices)))
+    eccentricities = Counter()
+    total_length = 0
+    total_paths = 0
+
+    for source in sources:
+        distances, order = bfs_distances(graph, source, profiler)
+        eccentricities[distances[order[-1]]] += 1
+        total_length += sum(distances[vertex] for vertex in order)
+        total_paths += len(order) - 1
+
+    return DiameterEstimate(
+        lower_bound_hops=max(eccentricities, default=0),
+        average_path_length=total_length / total_paths if total_paths else 0.0,
+        eccentricities=dict(sorted(eccentricities.items())),
+        sources=len(sources),
+    )
@@ -0,0 +1,75 @@
+from collections import Counter
+from typing import Dict, List
+
+
+# Union by rank with path compression over the ints 0..n-1. The number of
+# components and a histogram of their sizes are kept up to date on every union
+class DisjointSet:
+    def __init__(self, size: int = 0) -> None:
+        self.parent = list(range(size))
+        self.rank = [0] * size
+        self.size = [1] * size
+        self.count = size
+        self.size_counts = Counter({1: size}) if size else Counter()
+
+    def add(self) -> int:
+        item = len(self.parent)
+        self.parent.append(item)
+        self.rank.append(0)
+        self.size.append(1)
+        self.count += 1
+        self.size_counts[1] += 1
+
+        return item
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+
+        return root
+
+    def union(self, item1: int, item2: int) -> bool:
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return False
+
+        if self.rank[root1] < self.rank[root2]:
+            root1, root2 = root2, root1
+        elif self.rank[root1] == self.rank[root2]:
+            self.rank[root1] += 1
+
+        for size in (self.size[root1], self.size[root2]):
+            self.size_counts[size] -= 1
+            if not self.size_counts[size]:
+                del self.size_counts[size]
+
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        self.size_counts[self.size[root1]] += 1
+        self.count -= 1
+
+        return True
+
+    def connected(self, item1: int, item2: int) -> bool:
+        return self.find(item1) == self.find(item2)
+
+    def component_sizes(self) -> List[int]:
+        sizes = []
+        for size, count in sorted(self.size_counts.items(), reverse=True):
+            sizes.extend([size] * count)
+
+        return sizes
+
+    def groups(self) -> Dict[int, List[int]]:
+        groups = dict()
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+
+        return groups
+
+    def __len__(self) -> int:
+        return len(self.parent)
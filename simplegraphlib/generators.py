@@ -0,0 +1,98 @@
+from array import array
+from random import Random
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+# Seeded synthetic graphs in the project's edge list format: a first line with
+# the number of vertices, then one "u v" or "u v weight" line per edge, with
+# vertices numbered from 1
+
+Edge = Tuple[int, int]
+WeightedEdge = Tuple[int, int, float]
+
+WRITE_BATCH = 1 << 16
+
+
+def erdos_renyi(
+    vertices: int, edges: int, seed: Optional[int] = None
+) -> Iterator[Edge]:
+    random = Random(seed)
+    for _ in range(edges):
+        vert1 = random.randint(1, vertices)
+        vert2 = random.randint(1, vertices - 1)
+        yield vert1, vert2 if vert2 < vert1 else vert2 + 1
+
+
+def barabasi_albert(
+    vertices: int, edges_per_vertex: int, seed: Optional[int] = None
+) -> Iterator[Edge]:
+    random = Random(seed)
+    # Every endpoint is repeated once per edge, so a uniform pick from it is a
+    # degree-proportional pick of a vertex
+    endpoints = array("i")
+
+    for vertex in range(1, edges_per_vertex + 2):
+        for other in range(1, vertex):
+            endpoints.extend((vertex, other))
+            yield vertex, other
+
+    for vertex in range(edges_per_vertex + 2, vertices + 1):
+        targets = set()
+        while len(targets) < edges_per_vertex:
+            targets.add(endpoints[random.randrange(len(endpoints))])
+
+        for target in targets:
+            endpoints.extend((vertex, target))
+            yield vertex, target
+
+
+def grid(
+    rows: int, columns: int, shortcuts: float = 0.0, seed: Optional[int] = None
+) -> Iterator[Edge]:
+    # A road-like lattice: every cell linked to its right and lower neighbor,
+    # plus a fraction of random long range links
+    random = Random(seed)
+    for row in range(rows):
+        for column in range(columns):
+            vertex = row * columns + column + 1
+            if column + 1 < columns:
+                yield vertex, vertex + 1
+            if row + 1 < rows:
+                yield vertex, vertex + columns
+            if shortcuts and random.random() < shortcuts:
+                yield vertex, random.randint(1, rows * columns)
+
+
+def weighted(
+    edges: Iterable[Edge],
+    low: float = 0.1,
+    high: float = 10.0,
+    negative: float = 0.0,
+    seed: Optional[int] = None,
+) -> Iterator[WeightedEdge]:
+    random = Random(seed)
+    for vert1, vert2 in edges:
+        weight = round(random.uniform(low, high), 1) or low
+        if negative and random.random() < negative:
+            weight = -weight
+        yield vert1, vert2, weight
+
+
+def write_edge_list(
+    filePath: str, vertices: int, edges: Iterable[Union[Edge, WeightedEdge]]
+) -> int:
+    count = 0
+    with open(filePath, "w") as file:
+        file.write(f"{vertices}\n")
+        batch = []
+        for edge in edges:
+            batch.append(" ".join(map(str, edge)))
+            if len(batch) == WRITE_BATCH:
+                file.write("\n".join(batch) + "\n")
+                count += len(batch)
+                batch.clear()
+
+        if batch:
+            file.write("\n".join(batch) + "\n")
+            count += len(batch)
+
+    return count
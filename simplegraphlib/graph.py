@@ -1,217 +1,750 @@
-from statistics import mean, median
-from collections import defaultdict, deque
-from itertools import combinations
-from io import TextIOWrapper
-from typing import List, Union, DefaultDict, Set, Tuple, Callable
+from contextlib import contextmanager
+from collections import defaultdict
+from array import array
+from typing import (
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from batch import DistanceMatrix, distance_matrix
+from bit_matrix import BitMatrix
+from csr import CSRAdjacency, id_typecode, vertex_sort_key
+from degree_stats import DegreeHistogram
+from disjoint_set import DisjointSet
+from diameter import DiameterEstimate, exact_diameter, ifub_diameter, sample_diameter
+from loader import EdgeRows, is_snapshot, read_snapshot, write_snapshot
+from point_to_point import bidirectional_bfs
+from profiling import NULL_PROFILER, Profiler
+from report import ReportWriter
+from traversal import VisitedArray, iter_bfs, iter_bfs_levels, iter_dfs
+
+BACKENDS = ("dict", "csr")
+
+MATRIX_MODES = ("list", "packed")
+
+TRAVERSALS = ("bfs", "dfs")
+
+REPORT_SECTIONS = ("adjacency", "degrees", "components", "component_vertices")
+
+CHANGES = ("add_vertex", "remove_vertex", "add_edge", "remove_edge")
 
 
 class Graph:
-    def __init__(self, filePath: str, matrix: bool = False) -> None:
-        lines = list()
-        with open(filePath, "r") as file:
-            lines = file.readlines()
+    def __init__(
+        self,
+        filePath: str,
+        matrix: Union[bool, str] = False,
+        backend: str = "dict",
+        profile: bool = False,
+        matrixPath: Optional[str] = None,
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        if matrix is True:
+            matrix = "list"
+        if matrix and matrix not in MATRIX_MODES:
+            raise ValueError(
+                f"Unknown matrix mode {matrix!r}, expected one of {MATRIX_MODES}"
+            )
 
         self.matrix = matrix
-        self.graph = defaultdict(set)
-        self.number_of_edges = len(lines[1:])
-        self.__add_edges(lines[1:])
-        self.__get_degrees()
+        self.matrixPath = matrixPath
+        self.backend = backend
+        self.profiler = Profiler() if profile else NULL_PROFILER
+        self.__components = None
+        self.__component_ids: Dict[str, int] = dict()
+
+        with self.profiler.phase("parse"):
+            if is_snapshot(filePath):
+                self.__load_snapshot(filePath)
+            else:
+                rows = EdgeRows(filePath)
+                if backend == "csr":
+                    self.graph = CSRAdjacency.from_edges(
+                        (row[0], row[1]) for row in rows
+                    )
+                else:
+                    self.graph = defaultdict(set)
+                    self.__add_edges(rows)
+            self.number_of_edges = self.__count_edges()
+
+        with self.profiler.phase("degree_stats"):
+            self.__get_degrees()
 
         if matrix:
-            self.convert_to_matrix()
+            with self.profiler.phase("matrix_conversion"):
+                self.convert_to_matrix()
+
+    @contextmanager
+    def profile(self) -> Iterator[Profiler]:
+        previous = self.profiler
+        self.profiler = Profiler()
+        try:
+            yield self.profiler
+        finally:
+            self.profiler = previous
+
+    def stats(self) -> Dict[str, Dict]:
+        return self.profiler.as_dict()
 
     def convert_to_matrix(self) -> None:
-        vertices = len(self.graph)
-        ordered_keys = list(self.graph.keys())
-        ordered_keys.sort(key=lambda key: int(key))
+        if self.matrix == "packed":
+            self.matrix_graph = BitMatrix.from_mapping(self.graph, self.matrixPath)
+            return
+
+        # Rows and columns are both indexed by vertex number, so a gap in the
+        # numbering (or a removed vertex) is an empty row and column
+        vertices = max(map(int, self.graph.keys()), default=0)
 
         matrix = [[0 for j in range(vertices)] for i in range(vertices)]
 
-        for idx, vertice in enumerate(ordered_keys):
-            for edge in self.graph[vertice]:
-                matrix[idx][int(edge) - 1] = 1
+        for vertice, edges in self.graph.items():
+            for edge in edges:
+                matrix[int(vertice) - 1][int(edge) - 1] = 1
 
         self.matrix_graph = matrix
 
-    def report(self) -> None:
-        with open("out.txt", "w") as file:
-            components = self.connected_components()
+    @property
+    def min_degree(self) -> int:
+        return self.__degree_histogram().min
 
-            def write_line(text: str = "") -> None:
-                file.write(f"{text}\n")
+    @property
+    def max_degree(self) -> int:
+        return self.__degree_histogram().max
 
-            if not self.matrix:
-                for vertice in self.graph:
-                    file.write(vertice + " ")
+    @property
+    def med_degree(self) -> Union[int, float]:
+        return self.__degree_histogram().mean
 
-                    for edge in self.graph[vertice]:
-                        file.write(" --> " + edge)
+    @property
+    def median_degree(self) -> Union[int, float]:
+        return self.__degree_histogram().median
 
-                    write_line()
-            else:
-                for i in range(len(self.matrix_graph)):
-                    for j in range(len(self.matrix_graph)):
-                        file.write(str(self.matrix_graph[i][j]) + " ")
-                    write_line()
-
-            write_line()
-
-            write_line(f"Number of vertices: {len(self.graph)}")
-            write_line(f"Number of edges: {self.number_of_edges}")
-            write_line(f"Minimum degree: {self.min_degree}")
-            write_line(f"Maximum degree: {self.max_degree}")
-            write_line(f"Medium degree: {self.med_degree}")
-            write_line(f"Median degree: {self.median_degree}")
-            write_line(f"Number of Connected Components: {len(components)}")
-
-            for idx, component in enumerate(components):
-                write_line(
-                    f"Component {idx+1} - Length: {len(component)}, Vertices: {component}"
+    def add_vertex(self, vertice: str) -> None:
+        self.__check_mutable()
+        self.__check_label(vertice)
+        if vertice in self.graph:
+            return
+
+        degrees = self.__degree_histogram()
+        self.graph[vertice] = set()
+        degrees.add(0)
+        if self.matrix == "packed":
+            self.matrix_graph.add(vertice)
+        elif self.matrix:
+            self.__grow_matrix(int(vertice))
+        if self.__components is not None:
+            self.__component_id(vertice)
+
+    def remove_vertex(self, vertice: str) -> None:
+        self.__check_mutable()
+        if vertice not in self.graph:
+            return
+
+        for edge in list(self.graph[vertice]):
+            self.remove_edge(vertice, edge)
+
+        degrees = self.__degree_histogram()
+        del self.graph[vertice]
+        degrees.remove(0)
+        if self.matrix == "packed":
+            self.matrix_graph.remove(vertice)
+        self.__components = None
+
+    def add_edge(self, vert1: str, vert2: str) -> None:
+        self.__check_mutable()
+        self.__check_label(vert1)
+        self.__check_label(vert2)
+        self.add_vertex(vert1)
+        self.add_vertex(vert2)
+        if vert2 in self.graph[vert1]:
+            return
+
+        self.__link(vert1, vert2, True)
+        self.number_of_edges += 1
+
+        if self.__components is not None:
+            self.__components.union(
+                self.__component_id(vert1), self.__component_id(vert2)
+            )
+
+    def add_edges(self, edges: Iterable[Tuple[str, str]]) -> None:
+        for vert1, vert2 in edges:
+            self.add_edge(vert1, vert2)
+
+    def remove_edge(self, vert1: str, vert2: str) -> None:
+        self.__check_mutable()
+        if vert2 not in self.graph.get(vert1, ()):
+            return
+
+        self.__link(vert1, vert2, False)
+        self.number_of_edges -= 1
+        # Union-find cannot split a component, so it is rebuilt on next use
+        self.__components = None
+
+    def apply(self, changes: Iterable[Tuple[str, ...]]) -> None:
+        for change, *vertices in changes:
+            if change not in CHANGES:
+                raise ValueError(
+                    f"Unknown change {change!r}, expected one of {CHANGES}"
+                )
+            getattr(self, change)(*vertices)
+
+    def save_snapshot(self, filePath: str) -> None:
+        graph = self.__csr()
+        with self.profiler.phase("output"):
+            write_snapshot(
+                filePath,
+                len(graph),
+                self.number_of_edges,
+                {
+                    "offsets": array("q", graph.offsets),
+                    "neighbors": array(id_typecode(len(graph)), graph.neighbors_array),
+                },
+                graph.labels,
+            )
+
+    def report(
+        self,
+        filePath: Union[str, TextIO] = "out.txt",
+        sections: Optional[Iterable[str]] = None,
+        format: str = "text",
+    ) -> None:
+        sections = REPORT_SECTIONS if sections is None else tuple(sections)
+        for section in sections:
+            if section not in REPORT_SECTIONS:
+                raise ValueError(
+                    f"Unknown report section {section!r}, expected one of {REPORT_SECTIONS}"
+                )
+
+        with self.profiler.phase("output"), ReportWriter(filePath, format) as writer:
+            if "adjacency" in sections:
+                if not self.matrix or format != "text":
+                    writer.rows(
+                        "adjacency",
+                        (
+                            {"vertex": vertice, "edges": list(edges)}
+                            for vertice, edges in self.graph.items()
+                        ),
+                        lambda row: row["vertex"]
+                        + " "
+                        + "".join([" --> " + edge for edge in row["edges"]]),
+                    )
+                elif self.matrix == "packed":
+                    writer.rows(
+                        "adjacency",
+                        (
+                            {"cells": self.matrix_graph.row_text(i)}
+                            for i in range(len(self.matrix_graph))
+                        ),
+                        lambda row: row["cells"],
+                    )
+                else:
+                    writer.rows(
+                        "adjacency",
+                        (
+                            {"cells": "".join([f"{cell} " for cell in row])}
+                            for row in self.matrix_graph
+                        ),
+                        lambda row: row["cells"],
+                    )
+                writer.blank()
+
+            if "degrees" in sections:
+                writer.stats(
+                    "degrees",
+                    {
+                        "vertices": len(self.graph),
+                        "edges": self.number_of_edges,
+                        "min": self.min_degree,
+                        "max": self.max_degree,
+                        "mean": self.med_degree,
+                        "median": self.median_degree,
+                    },
+                    lambda stats: [
+                        f"Number of vertices: {stats['vertices']}",
+                        f"Number of edges: {stats['edges']}",
+                        f"Minimum degree: {stats['min']}",
+                        f"Maximum degree: {stats['max']}",
+                        f"Medium degree: {stats['mean']}",
+                        f"Median degree: {stats['median']}",
+                    ],
+                )
+
+            # The summary comes from the disjoint set, only the full listing
+            # needs the vertex lists of every component
+            if "components" in sections:
+                listed = "component_vertices" in sections
+                writer.stats(
+                    "components",
+                    {
+                        "count": self.number_of_components(),
+                        "sizes": self.component_sizes(),
+                    },
+                    lambda stats: [
+                        f"Number of Connected Components: {stats['count']}",
+                        *(
+                            []
+                            if listed
+                            else [
+                                f"Component {idx+1} - Length: {size}"
+                                for idx, size in enumerate(stats["sizes"])
+                            ]
+                        ),
+                    ],
                 )
 
-    def bfs_report(self, starting_node: str):
-        self.spanning_tree(starting_node, algorithm=self.bfs)
+            if "component_vertices" in sections:
+                writer.rows(
+                    "component_vertices",
+                    (
+                        {"component": idx + 1, "vertices": component}
+                        for idx, component in enumerate(self.connected_components())
+                    ),
+                    lambda row: f"Component {row['component']} - Length: "
+                    f"{len(row['vertices'])}, Vertices: {row['vertices']}",
+                )
 
-    def dfs_report(self, starting_node: str):
-        self.spanning_tree(starting_node, algorithm=self.dfs)
+    def bfs_report(
+        self,
+        starting_node: str,
+        max_depth: Optional[int] = None,
+        filePath: Union[str, TextIO, None] = None,
+        format: str = "text",
+    ):
+        self.spanning_tree(starting_node, "bfs", max_depth, filePath, format)
 
-    def spanning_tree(self, starting_node: str, algorithm: Callable) -> str:
-        tree, _ = algorithm(starting_node, tree=True)
+    def dfs_report(
+        self,
+        starting_node: str,
+        max_depth: Optional[int] = None,
+        filePath: Union[str, TextIO, None] = None,
+        format: str = "text",
+    ):
+        self.spanning_tree(starting_node, "dfs", max_depth, filePath, format)
 
-        with open(f"{algorithm.__name__}.txt", "w") as file:
-            level = 1
-            file.write(f"Level 0: {starting_node}\n")
-            self.__spanning_tree_helper(tree, starting_node, level, file)
+    def spanning_tree(
+        self,
+        starting_node: str,
+        algorithm: Union[str, Callable],
+        max_depth: Optional[int] = None,
+        filePath: Union[str, TextIO, None] = None,
+        format: str = "text",
+    ) -> None:
+        if algorithm == self.bfs:
+            algorithm = "bfs"
+        elif algorithm == self.dfs:
+            algorithm = "dfs"
+        if algorithm not in TRAVERSALS:
+            raise ValueError(
+                f"Unknown traversal {algorithm!r}, expected one of {TRAVERSALS}"
+            )
+
+        if algorithm == "bfs":
+            families = self.__families(self.iter_bfs(starting_node, max_depth))
+        else:
+            families = self.__preorder_families(self.iter_dfs(starting_node, max_depth))
+        if filePath is None:
+            filePath = f"{algorithm}.txt"
+
+        with self.profiler.phase("traversal"), ReportWriter(filePath, format) as writer:
+            writer.stats(
+                "root",
+                {"level": 0, "vertex": starting_node},
+                lambda root: [f"Level 0: {root['vertex']}"],
+            )
+            writer.rows(
+                "tree",
+                families,
+                lambda family: f"Level {family['level']}, Father {family['father']}: "
+                f"{' '.join(family['children'])} ",
+            )
+
+    def iter_bfs(
+        self, starting_node: str, max_depth: Optional[int] = None
+    ) -> Iterator[Tuple[str, Optional[str], int]]:
+        return self.__traverse(iter_bfs, starting_node, max_depth)
+
+    def iter_dfs(
+        self, starting_node: str, max_depth: Optional[int] = None
+    ) -> Iterator[Tuple[str, Optional[str], int]]:
+        return self.__traverse(iter_dfs, starting_node, max_depth, ordered=True)
+
+    def iter_bfs_levels(
+        self, starting_node: str, max_depth: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[str]]]:
+        if self.matrix == "packed" and starting_node in self.matrix_graph:
+            labels = self.matrix_graph.labels
+            for depth, level in self.matrix_graph.iter_levels(
+                self.matrix_graph.index[starting_node], max_depth
+            ):
+                yield depth, [labels[vertex] for vertex in level]
+        elif self.backend == "csr" and starting_node in self.graph:
+            labels = self.graph.labels
+            for depth, level in iter_bfs_levels(
+                self.graph.index[starting_node],
+                self.graph.neighbors,
+                max_depth,
+                VisitedArray(len(self.graph)),
+            ):
+                yield depth, [labels[vertex] for vertex in level]
+        else:
+            yield from iter_bfs_levels(starting_node, self.__neighbors, max_depth)
 
     def bfs(
         self, starting_node: str, tree: bool = False
     ) -> Union[List[str], Tuple[DefaultDict[str, Set[str]], str]]:
-
-        visited_nodes = list(starting_node)
-        queue = deque([starting_node])
-        tree_struct = defaultdict(set)
-
-        while queue:
-            node = queue.popleft()
-            for edge in self.graph[node]:
-                if edge not in visited_nodes:
-                    visited_nodes.append(edge)
-                    queue.append(edge)
-                    tree_struct[node].add(edge)
-
-        return (tree_struct, starting_node) if tree else visited_nodes
+        return self.__collect(self.iter_bfs(starting_node), starting_node, tree)
 
     def dfs(
         self, starting_node: str, tree: bool = False
     ) -> Union[List[str], Tuple[DefaultDict[str, Set[str]], str]]:
-        visited = list()
-        tree_struct = defaultdict(set)
-        self.__dfs_helper(visited, starting_node, tree_struct, starting_node)
-
-        return (tree_struct, starting_node) if tree else visited
+        return self.__collect(self.iter_dfs(starting_node), starting_node, tree)
 
     def shortest_path(self, start: str, goal: str) -> List[None]:
-        explored = []
-        queue = deque([[start]])
-
         if start == goal:
             return [start]
+        if start not in self.graph or goal not in self.graph:
+            return []
+
+        with self.profiler.phase("traversal"):
+            if self.backend == "csr":
+                labels = self.graph.labels
+                path = bidirectional_bfs(
+                    self.graph.index[start],
+                    self.graph.index[goal],
+                    self.graph.neighbors,
+                    self.profiler,
+                )
+                return [labels[vertex] for vertex in path]
 
-        while queue:
-            path = queue.popleft()
-            node = path[-1]
-
-            if node not in explored:
-                neighbors = self.graph[node]
-                for neighbor in neighbors:
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    queue.append(new_path)
-
-                    if neighbor == goal:
-                        return new_path
-
-                explored.append(node)
-
-        return []
+            return bidirectional_bfs(start, goal, self.__neighbors, self.profiler)
 
     def connected_components(self) -> List[List[str]]:
-        visited = list()
-        connected_vertices = []
-
-        for vertice in self.graph:
-            if vertice not in visited:
-                dfs = self.dfs(vertice)
-
-                visited.extend(dfs)
-                connected_vertices.append(dfs)
+        with self.profiler.phase("components"):
+            if self.matrix == "packed":
+                labels = self.matrix_graph.labels
+                groups = self.matrix_graph.components()
+            else:
+                groups = self.__disjoint_set().groups().values()
+                labels = (
+                    self.graph.labels
+                    if self.backend == "csr"
+                    else list(self.__component_ids)
+                )
 
+        connected_vertices = [[labels[vertex] for vertex in group] for group in groups]
         connected_vertices.sort(key=lambda component: len(component), reverse=True)
 
         return connected_vertices
 
-    def diameter(self) -> int:
-        max_shortest_path = 0
-        for vert1, vert2 in combinations(self.graph.keys(), 2):
-            path_size = len(self.shortest_path(vert1, vert2))
-            if path_size > max_shortest_path:
-                max_shortest_path = path_size
+    def number_of_components(self) -> int:
+        return self.__disjoint_set().count
 
-        return max_shortest_path
+    def component_sizes(self) -> List[int]:
+        return self.__disjoint_set().component_sizes()
 
-    def __spanning_tree_helper(
+    def distance_matrix(
         self,
-        tree: DefaultDict[str, Set[str]],
-        node: str,
-        level: int,
-        file: TextIOWrapper,
-    ):
-        if len(tree[node]) == 0:
+        sources: Optional[Iterable[str]] = None,
+        targets: Optional[Iterable[str]] = None,
+        workers: Optional[int] = None,
+        dtype: str = "float64",
+        filePath: Optional[str] = None,
+    ) -> DistanceMatrix:
+        graph = self.__csr()
+        sources = graph.labels if sources is None else list(sources)
+        targets = graph.labels if targets is None else list(targets)
+
+        with self.profiler.phase("distance_matrix"):
+            values = distance_matrix(
+                graph.offsets,
+                graph.neighbors_array,
+                None,
+                [graph.index[vertice] for vertice in sources],
+                (
+                    None
+                    if targets is graph.labels
+                    else [graph.index[vertice] for vertice in targets]
+                ),
+                workers,
+                dtype,
+                filePath,
+                profiler=self.profiler,
+            )
+
+        return DistanceMatrix(sources, targets, values)
+
+    def diameter(self, mode: str = "exact") -> int:
+        if mode not in ("exact", "ifub"):
+            raise ValueError(f"Unknown diameter mode {mode!r}")
+
+        with self.profiler.phase("diameter"):
+            if mode == "exact":
+                hops = exact_diameter(self.__csr(), self.profiler)
+            else:
+                hops = ifub_diameter(self.__csr(), self.profiler)
+
+        # Counts the vertices on the longest shortest path, as it always has,
+        # unlike diameter_sample which reports lower_bound_hops in edges
+        return hops + 1 if hops else 0
+
+    def diameter_sample(
+        self, samples: int, seed: Union[int, None] = None
+    ) -> DiameterEstimate:
+        with self.profiler.phase("diameter"):
+            return sample_diameter(self.__csr(), samples, seed, self.profiler)
+
+    def __disjoint_set(self) -> DisjointSet:
+        if self.__components is None:
+            if self.backend == "csr":
+                self.__components = DisjointSet(len(self.graph))
+                for vertex in range(len(self.graph)):
+                    for neighbor in self.graph.neighbors(vertex):
+                        if neighbor > vertex:
+                            self.__components.union(vertex, neighbor)
+            else:
+                self.__component_ids = {
+                    vertice: idx for idx, vertice in enumerate(self.graph)
+                }
+                self.__components = DisjointSet(len(self.graph))
+                for vertice, edges in self.graph.items():
+                    for edge in edges:
+                        self.__components.union(
+                            self.__component_ids[vertice], self.__component_ids[edge]
+                        )
+
+        # Lookups on the defaultdict may have created isolated vertices
+        if self.backend == "dict" and len(self.__component_ids) != len(self.graph):
+            for vertice in self.graph:
+                self.__component_id(vertice)
+
+        return self.__components
+
+    def __component_id(self, vertice: str) -> int:
+        idx = self.__component_ids.get(vertice)
+        if idx is None:
+            idx = self.__components.add()
+            self.__component_ids[vertice] = idx
+
+        return idx
+
+    def __csr(self) -> CSRAdjacency:
+        if self.backend == "csr":
+            return self.graph
+
+        return CSRAdjacency.from_mapping(self.graph)
+
+    def __traverse(
+        self,
+        algorithm: Callable,
+        starting_node: str,
+        max_depth: Optional[int],
+        ordered: bool = False,
+    ) -> Iterator[Tuple[str, Optional[str], int]]:
+        if self.backend == "csr" and starting_node in self.graph:
+            traversal = self.__labeled(
+                algorithm(
+                    self.graph.index[starting_node],
+                    self.graph.neighbors,
+                    max_depth,
+                    VisitedArray(len(self.graph)),
+                )
+            )
+        else:
+            neighbors = self.__ordered_neighbors if ordered else self.__neighbors
+            traversal = algorithm(starting_node, neighbors, max_depth)
+
+        return self.__counted(traversal) if self.profiler.enabled else traversal
+
+    def __labeled(
+        self, traversal: Iterator[Tuple[int, Optional[int], int]]
+    ) -> Iterator[Tuple[str, Optional[str], int]]:
+        labels = self.graph.labels
+        for vertex, parent, depth in traversal:
+            yield labels[vertex], None if parent is None else labels[parent], depth
+
+    def __counted(
+        self, traversal: Iterator[Tuple[str, Optional[str], int]]
+    ) -> Iterator[Tuple[str, Optional[str], int]]:
+        popped = scanned = 0
+        try:
+            for node, father, depth in traversal:
+                popped += 1
+                if self.backend == "csr":
+                    scanned += self.graph.degree(self.graph.index[node])
+                else:
+                    scanned += len(self.graph.get(node, ()))
+                yield node, father, depth
+        finally:
+            self.profiler.count("vertices_popped", popped)
+            self.profiler.count("edges_scanned", scanned)
+
+    def __check_mutable(self) -> None:
+        if self.backend == "csr":
+            raise TypeError("The csr backend is read-only, use backend='dict'")
+
+    # The list matrix is indexed by vertex number, so its labels must be 1, 2, ...
+    def __check_label(self, vertice: str) -> None:
+        if self.matrix != "list":
             return
 
-        file.write(f"Level {level}, Father {node}: ")
+        try:
+            number = int(vertice)
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise ValueError(
+                f"Vertex {vertice!r} has no matrix row, matrix=True needs labels 1, 2, ..."
+            )
+
+    def __link(self, vert1: str, vert2: str, linked: bool) -> None:
+        degrees = self.__degree_histogram()
+        for vertice, edge in {(vert1, vert2), (vert2, vert1)}:
+            degree = len(self.graph[vertice])
+            if linked:
+                self.graph[vertice].add(edge)
+            else:
+                self.graph[vertice].discard(edge)
+            degrees.move(degree, len(self.graph[vertice]))
+
+        if self.matrix == "packed":
+            self.matrix_graph.link(
+                self.matrix_graph.add(vert1), self.matrix_graph.add(vert2), linked
+            )
+        elif self.matrix:
+            self.__grow_matrix(max(int(vert1), int(vert2)))
+            self.matrix_graph[int(vert1) - 1][int(vert2) - 1] = int(linked)
+            self.matrix_graph[int(vert2) - 1][int(vert1) - 1] = int(linked)
+
+    def __grow_matrix(self, size: int) -> None:
+        missing = size - len(self.matrix_graph)
+        if missing <= 0:
+            return
 
-        for child in tree[node]:
-            file.write(f"{child} ")
+        for row in self.matrix_graph:
+            row.extend([0] * missing)
+        self.matrix_graph.extend([0] * size for _ in range(missing))
 
-        file.write("\n")
-        level += 1
+    def __neighbors(self, vertice: str) -> Set[str]:
+        return self.graph.get(vertice, ())
 
-        for child in tree[node]:
-            self.__spanning_tree_helper(tree, child, level, file)
+    def __ordered_neighbors(self, vertice: str) -> List[str]:
+        return sorted(self.graph.get(vertice, ()), key=vertex_sort_key)
 
-    def __dfs_helper(
+    def __collect(
         self,
-        visited_list: List[str],
-        node: str,
-        tree: DefaultDict[str, Set[str]],
-        father: str,
-    ) -> List[str]:
-        if node not in visited_list:
-            ordered_neighbors = list(self.graph[node])
-            ordered_neighbors.sort(key=lambda vertice: int(vertice))
-
-            visited_list.append(node)
-            if father != node:
-                tree[father].add(node)
-            for neighbor in ordered_neighbors:
-                self.__dfs_helper(visited_list, neighbor, tree, node)
-
-    def __get_degrees(self) -> int:
-        list_of_degrees = []
-        for edges in self.graph.values():
-            list_of_degrees.append(len(edges))
-
-        list_of_degrees.sort()
-
-        self.min_degree = list_of_degrees[0]
-        self.max_degree = list_of_degrees[-1]
-        self.med_degree = mean(list_of_degrees)
-        self.median_degree = median(list_of_degrees)
-
-    def __add_edges(self, edge_strings: List[str]) -> None:
-        for edge_string in edge_strings:
-            vert1, vert2 = tuple(edge_string.strip().split(" "))
+        traversal: Iterator[Tuple[str, Optional[str], int]],
+        starting_node: str,
+        tree: bool,
+    ) -> Union[List[str], Tuple[DefaultDict[str, Set[str]], str]]:
+        visited = list()
+        tree_struct = defaultdict(set)
+
+        with self.profiler.phase("traversal"):
+            for node, father, _ in traversal:
+                visited.append(node)
+                if father is not None:
+                    tree_struct[father].add(node)
+
+        return (tree_struct, starting_node) if tree else visited
+
+    # BFS yields a father's children one after another, fathers in BFS order,
+    # so a family is complete once the father changes and only it is kept
+    def __families(
+        self, traversal: Iterator[Tuple[str, Optional[str], int]]
+    ) -> Iterator[Dict]:
+        family_father, family_level, family = None, 0, []
+
+        for node, father, level in traversal:
+            if father != family_father:
+                yield from self.__family(family_father, family_level, family)
+                family_father, family_level, family = father, level - 1, []
+            if father is not None:
+                family.append(node)
+
+        yield from self.__family(family_father, family_level, family)
+
+    # DFS only moves past a father after its whole subtree, so the tree is
+    # kept and walked to write each family before the families below it
+    def __preorder_families(
+        self, traversal: Iterator[Tuple[str, Optional[str], int]]
+    ) -> Iterator[Dict]:
+        children = defaultdict(list)
+        stack = []
+
+        for node, father, level in traversal:
+            if father is None:
+                stack.append((node, level))
+            else:
+                children[father].append(node)
+
+        while stack:
+            father, level = stack.pop()
+            family = children.pop(father, [])
+            yield from self.__family(father, level, family)
+            stack.extend((child, level + 1) for child in reversed(family))
+
+    def __family(self, father: str, level: int, children: List[str]) -> Iterator[Dict]:
+        if children:
+            yield {"level": level + 1, "father": father, "children": children}
+
+    def __get_degrees(self) -> None:
+        if self.backend == "csr":
+            self.__degrees = DegreeHistogram(self.graph.degrees())
+        else:
+            self.__degrees = DegreeHistogram(
+                len(edges) for edges in self.graph.values()
+            )
+
+    def __degree_histogram(self) -> DegreeHistogram:
+        # Lookups on the defaultdict may have created isolated vertices
+        missing = len(self.graph) - len(self.__degrees)
+        if missing > 0:
+            self.__degrees.add(0, missing)
+
+        return self.__degrees
+
+    def __load_snapshot(self, filePath: str) -> None:
+        snapshot = read_snapshot(filePath)
+        graph = CSRAdjacency(
+            snapshot.labels, snapshot.arrays["offsets"], snapshot.arrays["neighbors"]
+        )
+
+        if self.backend == "csr":
+            self.graph = graph
+        else:
+            self.graph = defaultdict(set)
+            for vertice, edges in graph.items():
+                self.graph[vertice].update(edges)
+
+    # Repeated rows collapse in the adjacency, and a self loop sits once in its
+    # own row, so it is counted twice before halving
+    def __count_edges(self) -> int:
+        if self.backend == "csr":
+            degrees = self.graph.degrees()
+            loops = (
+                vertex in self.graph.neighbors(vertex)
+                for vertex in range(len(self.graph))
+            )
+        else:
+            degrees = (len(edges) for edges in self.graph.values())
+            loops = (vertice in edges for vertice, edges in self.graph.items())
+
+        return (sum(degrees) + sum(loops)) // 2
+
+    def __add_edges(self, rows: Iterable[List[str]]) -> None:
+        for row in rows:
+            vert1, vert2 = row[0], row[1]
             self.graph[vert1].add(vert2)
             self.graph[vert2].add(vert1)
 
@@ -0,0 +1,125 @@
+import mmap
+import struct
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Sequence
+
+CHUNK_SIZE = 1 << 22
+
+SNAPSHOT_MAGIC = b"SGLSNAP\x01"
+SNAPSHOT_HEADER = struct.Struct("<8sqqq")
+SNAPSHOT_SECTION = struct.Struct("<16s8sqq")
+
+
+# Yields the whitespace separated fields of every non-empty line, reading the
+# file in large chunks instead of materializing a list of lines
+def read_rows(filePath: str, chunk_size: int = CHUNK_SIZE) -> Iterator[List[str]]:
+    with open(filePath, "r") as file:
+        leftover = ""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+
+            chunk = leftover + chunk
+            cut = chunk.rfind("\n") + 1
+            leftover = chunk[cut:]
+
+            for line in chunk[:cut].splitlines():
+                row = line.split()
+                if row:
+                    yield row
+
+        row = leftover.split()
+        if row:
+            yield row
+
+
+class EdgeRows:
+    def __init__(self, filePath: str, chunk_size: int = CHUNK_SIZE) -> None:
+        self.__rows = read_rows(filePath, chunk_size)
+        self.header = next(self.__rows, [])
+        self.count = 0
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for row in self.__rows:
+            self.count += 1
+            yield row
+
+
+class Snapshot(NamedTuple):
+    vertices: int
+    number_of_edges: int
+    arrays: Dict[str, Sequence]
+    labels: List[str]
+
+
+def is_snapshot(filePath: str) -> bool:
+    with open(filePath, "rb") as file:
+        return file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+
+def write_snapshot(
+    filePath: str,
+    vertices: int,
+    number_of_edges: int,
+    arrays: Dict[str, array],
+    labels: Sequence[str] = (),
+) -> None:
+    sections = dict(arrays)
+    if labels:
+        sections["labels"] = array("B", "\n".join(labels).encode())
+
+    position = SNAPSHOT_HEADER.size + SNAPSHOT_SECTION.size * len(sections)
+    table = []
+    for name, values in sections.items():
+        position += -position % 8
+        table.append((name, values, position))
+        position += len(values) * values.itemsize
+
+    with open(filePath, "wb") as file:
+        file.write(
+            SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, vertices, number_of_edges, len(sections)
+            )
+        )
+        for name, values, start in table:
+            file.write(
+                SNAPSHOT_SECTION.pack(
+                    name.encode(),
+                    values.typecode.encode(),
+                    start,
+                    len(values) * values.itemsize,
+                )
+            )
+        for _, values, start in table:
+            file.write(bytes(start - file.tell()))
+            values.tofile(file)
+
+
+# Arrays come back as memoryviews over a shared read-only mapping, so only
+# the pages that are actually touched get read from disk
+def read_snapshot(filePath: str) -> Snapshot:
+    with open(filePath, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, vertices, number_of_edges, count = SNAPSHOT_HEADER.unpack_from(mapping)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{filePath} is not a graph snapshot")
+
+    view = memoryview(mapping)
+    arrays = dict()
+    labels = []
+
+    for idx in range(count):
+        name, typecode, start, length = SNAPSHOT_SECTION.unpack_from(
+            mapping, SNAPSHOT_HEADER.size + idx * SNAPSHOT_SECTION.size
+        )
+        name = name.rstrip(b"\0").decode()
+        section = view[start : start + length]
+
+        if name == "labels":
+            labels = str(section, "utf-8").split("\n") if length else []
+        else:
+            arrays[name] = section.cast(typecode.rstrip(b"\0").decode())
+
+    return Snapshot(vertices, number_of_edges, arrays, labels)
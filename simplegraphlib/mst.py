@@ -0,0 +1,68 @@
+from heapq import heapify, heappop, heappush
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from disjoint_set import DisjointSet
+from profiling import NULL_PROFILER, Profiler
+
+Edge = Tuple[int, int, float]
+
+# Both algorithms yield (parent, child, weight) with 0-based vertices as soon as
+# an edge is chosen, and cover every component (a minimum spanning forest)
+
+
+def prim(
+    adjacency: List[Dict[int, float]], profiler: Profiler = NULL_PROFILER
+) -> Iterator[Edge]:
+    visited = bytearray(len(adjacency))
+    popped = pushes = 0
+
+    try:
+        for root in range(len(adjacency)):
+            if visited[root]:
+                continue
+
+            visited[root] = 1
+            heap = [
+                (weight, root, vertex) for vertex, weight in adjacency[root].items()
+            ]
+            heapify(heap)
+            pushes += len(heap)
+
+            # Lazy deletion: stale entries are skipped when popped
+            while heap:
+                weight, parent, vertex = heappop(heap)
+                popped += 1
+                if visited[vertex]:
+                    continue
+
+                visited[vertex] = 1
+                yield parent, vertex, weight
+
+                for neighbor, neighbor_weight in adjacency[vertex].items():
+                    if not visited[neighbor]:
+                        heappush(heap, (neighbor_weight, vertex, neighbor))
+                        pushes += 1
+    finally:
+        profiler.count("heap_pops", popped)
+        profiler.count("heap_pushes", pushes)
+
+
+def kruskal(
+    vertices: int, edges: Iterable[Edge], profiler: Profiler = NULL_PROFILER
+) -> Iterator[Edge]:
+    components = DisjointSet(vertices)
+    edges = sorted(edges, key=lambda edge: edge[2])
+    scanned = unions = 0
+
+    try:
+        for vert1, vert2, weight in edges:
+            scanned += 1
+            if components.union(vert1, vert2):
+                unions += 1
+                yield vert1, vert2, weight
+                if components.count == 1:
+                    return
+    finally:
+        profiler.count("edges_sorted", len(edges))
+        profiler.count("edges_scanned", scanned)
+        profiler.count("unions", unions)
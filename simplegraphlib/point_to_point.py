@@ -0,0 +1,171 @@
+from heapq import heappop, heappush
+from math import inf
+from typing import Callable, Collection, Dict, Hashable, List, Optional, Tuple
+
+from profiling import NULL_PROFILER, Profiler
+
+# Single start -> goal queries that stop as soon as the answer is known,
+# instead of building the whole shortest path tree from the start. Counters
+# are kept in local ints and reported once per query
+
+
+def bidirectional_bfs(
+    start: Hashable,
+    goal: Hashable,
+    neighbors: Callable[[Hashable], Collection],
+    profiler: Profiler = NULL_PROFILER,
+) -> List[Hashable]:
+    if start == goal:
+        return [start]
+
+    parents = ({start: None}, {goal: None})
+    depths = ({start: 0}, {goal: 0})
+    levels = [[start], [goal]]
+    popped = scanned = 0
+
+    try:
+        while levels[0] and levels[1]:
+            # Grow the side with the smaller frontier by one whole level
+            side = 0 if len(levels[0]) <= len(levels[1]) else 1
+            own_parents, own_depths = parents[side], depths[side]
+            other_depths = depths[1 - side]
+            best, meeting = inf, None
+            next_level = []
+            popped += len(levels[side])
+
+            for node in levels[side]:
+                depth = own_depths[node] + 1
+                edges = neighbors(node)
+                scanned += len(edges)
+                for neighbor in edges:
+                    if neighbor not in own_parents:
+                        own_parents[neighbor] = node
+                        own_depths[neighbor] = depth
+                        next_level.append(neighbor)
+
+                    other = other_depths.get(neighbor)
+                    if other is not None and depth + other < best:
+                        best, meeting = depth + other, (node, neighbor)
+
+            if meeting is not None:
+                node, neighbor = meeting
+                path = _join(own_parents, node)
+                path += _join(parents[1 - side], neighbor)[::-1]
+                return path if side == 0 else path[::-1]
+
+            levels[side] = next_level
+    finally:
+        profiler.count("vertices_popped", popped)
+        profiler.count("edges_scanned", scanned)
+
+    return []
+
+
+def bidirectional_dijkstra(
+    start: int,
+    goal: int,
+    adjacency: List[Dict[int, float]],
+    profiler: Profiler = NULL_PROFILER,
+) -> Tuple[float, List[int]]:
+    if start == goal:
+        return 0, [start]
+
+    # The graph is undirected, so the backward search uses the same lists
+    distances = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    settled = (set(), set())
+    heaps = ([(0, start)], [(0, goal)])
+    best, meeting = inf, None
+    popped = scanned = relaxations = 0
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, node = heappop(heaps[side])
+        if node in settled[side]:
+            continue
+        settled[side].add(node)
+        popped += 1
+        scanned += len(adjacency[node])
+
+        for neighbor, weight in adjacency[node].items():
+            testing_value = round(distance + weight, 1)
+            if testing_value < distances[side].get(neighbor, inf):
+                distances[side][neighbor] = testing_value
+                parents[side][neighbor] = node
+                heappush(heaps[side], (testing_value, neighbor))
+                relaxations += 1
+
+            other = distances[1 - side].get(neighbor)
+            if other is not None:
+                total = round(distances[side][neighbor] + other, 1)
+                if total < best:
+                    best, meeting = total, neighbor
+
+    profiler.count("vertices_popped", popped)
+    profiler.count("edges_scanned", scanned)
+    profiler.count("relaxations", relaxations)
+    profiler.count("heap_pushes", relaxations + 2)
+    if meeting is None:
+        return inf, []
+
+    return best, _join(parents[0], meeting) + _join(parents[1], meeting)[-2::-1]
+
+
+def astar(
+    start: int,
+    goal: int,
+    adjacency: List[Dict[int, float]],
+    heuristic: Callable[[int, int], float],
+    profiler: Profiler = NULL_PROFILER,
+) -> Tuple[float, List[int]]:
+    distances = {start: 0}
+    parents: Dict[int, Optional[int]] = {start: None}
+    settled = set()
+    heap = [(heuristic(start, goal), 0, start)]
+    popped = scanned = relaxations = 0
+
+    try:
+        while heap:
+            _, distance, node = heappop(heap)
+            if node == goal:
+                return distance, _join(parents, goal)
+            if node in settled:
+                continue
+            settled.add(node)
+            popped += 1
+            scanned += len(adjacency[node])
+
+            for neighbor, weight in adjacency[node].items():
+                testing_value = round(distance + weight, 1)
+                if testing_value < distances.get(neighbor, inf):
+                    distances[neighbor] = testing_value
+                    parents[neighbor] = node
+                    heappush(
+                        heap,
+                        (
+                            testing_value + heuristic(neighbor, goal),
+                            testing_value,
+                            neighbor,
+                        ),
+                    )
+                    relaxations += 1
+    finally:
+        profiler.count("vertices_popped", popped)
+        profiler.count("edges_scanned", scanned)
+        profiler.count("relaxations", relaxations)
+        profiler.count("heap_pushes", relaxations + 1)
+
+    return inf, []
+
+
+def _join(parents: Dict, node: Hashable) -> List[Hashable]:
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+
+    path.reverse()
+    return path
@@ -0,0 +1,65 @@
+import json
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Dict, Iterator
+
+
+# Wall time per phase plus operation counters. Algorithms keep their counters
+# in local ints and report them once per run, so the hot loops never call in here
+class Profiler:
+    enabled = True
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = Counter()
+        self.counters: Dict[str, int] = Counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += perf_counter() - start
+            self.calls[name] += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {
+            "phases": {
+                name: {"seconds": round(seconds, 6), "calls": self.calls[name]}
+                for name, seconds in self.seconds.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+class NullProfiler:
+    enabled = False
+
+    def __init__(self) -> None:
+        self.__context = nullcontext()
+
+    def phase(self, name: str) -> nullcontext:
+        return self.__context
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {"phases": {}, "counters": {}}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,105 @@
+import json
+from typing import Any, Callable, Dict, Iterable, List, TextIO, Union
+
+REPORT_FORMATS = ("text", "json", "ndjson")
+
+WRITE_BUFFER = 1 << 20
+
+# Pieces of output joined into a single file.write call
+WRITE_BATCH = 4096
+
+
+# Every report goes through here as named sections. Text keeps the historic
+# layout, json writes one object keyed by section, and ndjson one object per
+# line tagged with its section. Output is streamed in batches, so a section
+# is never held in memory as a whole
+class ReportWriter:
+    def __init__(
+        self,
+        target: Union[str, TextIO],
+        format: str = "text",
+        buffer_size: int = WRITE_BUFFER,
+    ) -> None:
+        if format not in REPORT_FORMATS:
+            raise ValueError(
+                f"Unknown report format {format!r}, expected one of {REPORT_FORMATS}"
+            )
+
+        self.format = format
+        self.__owned = isinstance(target, str)
+        self.file = open(target, "w", buffering=buffer_size) if self.__owned else target
+        self.__batch: List[str] = []
+        self.__sections = 0
+
+        if format == "json":
+            self.__write("{")
+
+    def stats(
+        self,
+        section: str,
+        values: Dict[str, Any],
+        text: Callable[[Dict[str, Any]], Iterable[str]],
+    ) -> None:
+        if self.format == "text":
+            for line in text(values):
+                self.__write(f"{line}\n")
+        elif self.format == "json":
+            self.__key(section)
+            self.__write(self.__dumps(values))
+        else:
+            self.__write(self.__dumps({"section": section, **values}) + "\n")
+
+    def rows(
+        self,
+        section: str,
+        rows: Iterable[Dict[str, Any]],
+        text: Callable[[Dict[str, Any]], str],
+    ) -> None:
+        if self.format == "text":
+            for row in rows:
+                self.__write(f"{text(row)}\n")
+        elif self.format == "json":
+            self.__key(section)
+            self.__write("[")
+            separator = ""
+            for row in rows:
+                self.__write(separator + self.__dumps(row))
+                separator = ","
+            self.__write("]")
+        else:
+            for row in rows:
+                self.__write(self.__dumps({"section": section, **row}) + "\n")
+
+    def blank(self) -> None:
+        if self.format == "text":
+            self.__write("\n")
+
+    def close(self) -> None:
+        if self.format == "json":
+            self.__write("}\n")
+        self.file.write("".join(self.__batch))
+        self.__batch.clear()
+
+        if self.__owned:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __key(self, section: str) -> None:
+        self.__write(("," if self.__sections else "") + json.dumps(section) + ":")
+        self.__sections += 1
+
+    def __dumps(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    def __write(self, text: str) -> None:
+        self.__batch.append(text)
+        if len(self.__batch) >= WRITE_BATCH:
+            self.file.write("".join(self.__batch))
+            self.__batch.clear()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import os
+import signal
+import threading
+from contextlib import suppress
+from argparse import ArgumentParser
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+from csr import vertex_sort_key
+from graph import BACKENDS, Graph
+from weighted_graph import WeightedGraph
+
+# Requests and responses are one JSON object per line:
+#   {"id": 1, "graph": "roads", "method": "shortest_path", "params": {...}}
+#   {"id": 1, "result": ...} or {"id": 1, "error": {"type": ..., "message": ...}}
+
+GRAPH_KINDS = ("graph", "weighted")
+
+# Answered straight from the server's own copy instead of the worker pool
+INLINE_METHODS = ("neighbors", "degrees")
+
+# Graphs and their locks, shared by the query threads or loaded once per
+# worker process by _init_worker
+_state = dict()
+
+
+class GraphSpec(NamedTuple):
+    kind: str
+    filePath: str
+    options: Dict[str, Any] = {}
+
+
+def load(spec: GraphSpec) -> Union[Graph, WeightedGraph]:
+    if spec.kind == "graph":
+        return Graph(spec.filePath, **spec.options)
+    if spec.kind == "weighted":
+        return WeightedGraph(spec.filePath, **spec.options)
+
+    raise ValueError(f"Unknown graph kind {spec.kind!r}, expected one of {GRAPH_KINDS}")
+
+
+def _neighbors(graph: Union[Graph, WeightedGraph], vertex) -> Any:
+    if isinstance(graph, WeightedGraph):
+        if not isinstance(vertex, int) or not 1 <= vertex <= graph.vertices:
+            raise ValueError(f"Vertex {vertex!r} is not in the graph")
+        return {
+            neighbor + 1: weight
+            for neighbor, weight in graph.adjacency[vertex - 1].items()
+        }
+
+    return sorted(graph.graph.get(vertex, ()), key=vertex_sort_key)
+
+
+def _degrees(graph: Union[Graph, WeightedGraph]) -> Dict[str, Any]:
+    return {
+        "vertices": len(graph) if isinstance(graph, Graph) else graph.vertices,
+        "edges": graph.number_of_edges,
+        "min": graph.min_degree,
+        "max": graph.max_degree,
+        "mean": graph.med_degree,
+        "median": graph.median_degree,
+    }
+
+
+def _distances(graph: Union[Graph, WeightedGraph], start) -> Any:
+    if isinstance(graph, WeightedGraph):
+        return graph.min_distances(start)
+
+    return {
+        vertice: depth
+        for depth, level in graph.iter_bfs_levels(start)
+        for vertice in level
+    }
+
+
+def _mst(graph: WeightedGraph, algorithm: str = "prim") -> Dict[str, Any]:
+    output = StringIO()
+    graph.mst(algorithm, output, "json")
+    return json.loads(output.getvalue())
+
+
+QUERIES: Dict[str, Dict[str, Callable]] = {
+    "graph": {
+        "neighbors": _neighbors,
+        "degrees": _degrees,
+        "bfs": lambda graph, start: graph.bfs(start),
+        "dfs": lambda graph, start: graph.dfs(start),
+        "shortest_path": lambda graph, start, goal: graph.shortest_path(start, goal),
+        "distances": _distances,
+        "components": lambda graph: graph.connected_components(),
+        "component_sizes": lambda graph: graph.component_sizes(),
+    },
+    "weighted": {
+        "neighbors": _neighbors,
+        "degrees": _degrees,
+        "shortest_path": lambda graph, start, end: graph.shortest_path(start, end),
+        "distance": lambda graph, start, end: graph.min_distance(start, end),
+        "distances": _distances,
+        "mst": _mst,
+    },
+}
+
+
+def _share(graphs: Dict[str, Union[Graph, WeightedGraph]]) -> None:
+    _state["graphs"] = graphs
+    _state["locks"] = {name: threading.Lock() for name in graphs}
+
+
+def _init_worker(specs: Dict[str, GraphSpec]) -> None:
+    _share({name: load(spec) for name, spec in specs.items()})
+
+
+# Queries fill the graphs' caches, so one graph answers one query at a time
+def _run(name: str, method: str, params: Dict[str, Any]) -> Any:
+    graph = _state["graphs"][name]
+    kind = "weighted" if isinstance(graph, WeightedGraph) else "graph"
+    with _state["locks"][name]:
+        return QUERIES[kind][method](graph, **params)
+
+
+# Every graph is loaded once, then requests from any number of connections
+# share the warm copy (and its caches) through a pool of query threads.
+# With processes=True each worker loads its own copy at start() instead,
+# which only shares memory for snapshots opened with backend="csr"; those
+# stay memory-mapped, every other graph is copied into every worker
+class GraphServer:
+    def __init__(
+        self,
+        specs: Dict[str, GraphSpec],
+        workers: Optional[int] = None,
+        processes: bool = False,
+    ) -> None:
+        self.specs = dict(specs)
+        self.graphs = {name: load(spec) for name, spec in self.specs.items()}
+        self.workers = workers
+        self.processes = processes
+        self.executor: Optional[Executor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections: Dict[asyncio.StreamWriter, asyncio.Task] = dict()
+
+    async def start(
+        self,
+        filePath: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> asyncio.AbstractServer:
+        if self.processes:
+            workers = self.workers or os.cpu_count() or 1
+            self.executor = ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(self.specs,)
+            )
+            # Workers are spawned on demand, so the loads happen here rather
+            # than on the first queries
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self.executor, os.getpid)
+                    for _ in range(workers)
+                )
+            )
+        else:
+            _share(self.graphs)
+            self.executor = ThreadPoolExecutor(self.workers or 1)
+
+        if filePath is not None:
+            self.server = await asyncio.start_unix_server(self.__serve, filePath)
+        else:
+            self.server = await asyncio.start_server(self.__serve, host, port)
+
+        return self.server
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            # Idle connections would otherwise keep their handlers waiting
+            for writer in list(self.connections):
+                writer.close()
+            await asyncio.gather(*self.connections.values(), return_exceptions=True)
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    async def query(self, name: str, method: str, params: Dict[str, Any]) -> Any:
+        graph = self.graphs.get(name)
+        if graph is None:
+            raise ValueError(f"Unknown graph {name!r}")
+
+        kind = "weighted" if isinstance(graph, WeightedGraph) else "graph"
+        if method not in QUERIES[kind]:
+            raise ValueError(
+                f"Unknown method {method!r} for a {kind}, expected one of "
+                f"{tuple(QUERIES[kind])}"
+            )
+
+        if method in INLINE_METHODS:
+            return QUERIES[kind][method](graph, **params)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _run, name, method, params)
+
+    # Requests on one connection run concurrently and are answered as they
+    # finish, so clients match responses to requests by id
+    async def __serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        lock = asyncio.Lock()
+        pending = set()
+        self.connections[writer] = asyncio.current_task()
+
+        async def answer(line: bytes) -> None:
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get("id")
+                result = await self.query(
+                    request["graph"], request["method"], request.get("params", {})
+                )
+                response = {"id": request_id, "result": result}
+            except Exception as error:
+                response = {
+                    "id": request_id,
+                    "error": {"type": type(error).__name__, "message": str(error)},
+                }
+
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.wait(pending)
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+
+def parse_spec(
+    kind: str, value: str, options: Optional[Dict[str, Any]] = None
+) -> tuple:
+    name, sep, filePath = value.partition("=")
+    if not sep:
+        raise ValueError(f"Expected NAME=PATH, got {value!r}")
+
+    return name, GraphSpec(kind, filePath, dict(options or {}))
+
+
+async def serve(
+    specs: Dict[str, GraphSpec],
+    filePath: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    workers: Optional[int] = None,
+    processes: bool = False,
+) -> None:
+    daemon = GraphServer(specs, workers, processes)
+    server = await daemon.start(filePath, host, port)
+    where = filePath or ":".join(map(str, server.sockets[0].getsockname()[:2]))
+    print(f"Serving {', '.join(specs)} on {where}", flush=True)
+
+    # Stop on SIGINT/SIGTERM by closing connections and the socket file
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+
+    try:
+        await stop.wait()
+    finally:
+        await daemon.close()
+        if filePath is not None and os.path.exists(filePath):
+            os.unlink(filePath)
+
+
+def main() -> int:
+    parser = ArgumentParser(description="Answer graph queries from warm graphs")
+    parser.add_argument("--graph", action="append", default=[], metavar="NAME=PATH")
+    parser.add_argument("--weighted", action="append", default=[], metavar="NAME=PATH")
+    parser.add_argument("--socket", help="unix socket path, instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--backend", choices=BACKENDS, default="dict")
+    parser.add_argument("--workers", type=int, help="query threads or processes")
+    parser.add_argument(
+        "--processes", action="store_true", help="run queries in worker processes"
+    )
+    args = parser.parse_args()
+
+    options = {"backend": args.backend}
+    specs: List[tuple] = [parse_spec("graph", value, options) for value in args.graph]
+    specs += [parse_spec("weighted", value) for value in args.weighted]
+    if not specs:
+        parser.error("at least one --graph or --weighted is required")
+
+    try:
+        asyncio.run(
+            serve(
+                dict(specs),
+                args.socket,
+                args.host,
+                args.port,
+                args.workers,
+                args.processes,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
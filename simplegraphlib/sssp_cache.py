@@ -0,0 +1,102 @@
+from array import array
+from collections import OrderedDict
+from math import inf
+from sys import maxsize
+from typing import Dict, List, Optional
+
+
+# Compact result of one single-source run: distances with inf for unreachable
+# vertices and 1-based predecessors with 0 for "none"
+class ShortestPathTree:
+    def __init__(
+        self, start: int, distances: List[float], predecessor: List[Optional[int]]
+    ) -> None:
+        self.start = start
+        self.distances = array(
+            "d", (inf if distance == maxsize else distance for distance in distances)
+        )
+        self.predecessor = array(
+            "q", (0 if vertex is None else vertex for vertex in predecessor)
+        )
+
+    def distance(self, end: int) -> float:
+        distance = self.distances[end - 1]
+        return maxsize if distance == inf else distance
+
+    def distance_list(self) -> List[float]:
+        return [maxsize if distance == inf else distance for distance in self.distances]
+
+    def path(self, end: int) -> List[int]:
+        path = [end]
+        while self.predecessor[path[-1] - 1]:
+            path.append(self.predecessor[path[-1] - 1])
+
+        path.reverse()
+        return path
+
+    def nbytes(self) -> int:
+        return sum(
+            values.itemsize * len(values)
+            for values in (self.distances, self.predecessor)
+        )
+
+
+class ShortestPathCache:
+    def __init__(self, max_entries: int = 16, max_bytes: Optional[int] = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[int, ShortestPathTree]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, start: int) -> Optional[ShortestPathTree]:
+        tree = self.entries.get(start)
+        if tree is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(start)
+        return tree
+
+    def put(self, tree: ShortestPathTree) -> None:
+        size = tree.nbytes()
+        if self.max_entries <= 0 or (
+            self.max_bytes is not None and size > self.max_bytes
+        ):
+            return
+
+        if tree.start in self.entries:
+            self.bytes -= self.entries.pop(tree.start).nbytes()
+
+        while self.entries and (
+            len(self.entries) >= self.max_entries
+            or (self.max_bytes is not None and self.bytes + size > self.max_bytes)
+        ):
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.nbytes()
+            self.evictions += 1
+
+        self.entries[tree.start] = tree
+        self.bytes += size
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __contains__(self, start: int) -> bool:
+        return start in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
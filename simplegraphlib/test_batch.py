@@ -0,0 +1,150 @@
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from math import inf
+from multiprocessing import shared_memory
+from sys import maxsize
+
+import pytest
+
+import batch
+from bellman_ford import NegativeCicleError
+from generators import erdos_renyi, weighted, write_edge_list
+from graph import Graph
+from weighted_graph import WeightedGraph
+
+
+def hop_rows(graph, sources, targets):
+    rows = []
+    for source in sources:
+        depths = {
+            vertice: depth
+            for depth, level in graph.iter_bfs_levels(source)
+            for vertice in level
+        }
+        rows.append([depths.get(target, inf) for target in targets])
+
+    return rows
+
+
+def matrix_rows(matrix):
+    return [matrix.row(idx) for idx in range(matrix.shape[0])]
+
+
+@pytest.fixture
+def graph(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 60, erdos_renyi(60, 55, seed=1))
+
+    return Graph(filePath, backend="csr")
+
+
+@pytest.fixture
+def weighted_graph(tmp_path):
+    filePath = str(tmp_path / "weighted.txt")
+    write_edge_list(filePath, 50, weighted(erdos_renyi(50, 70, seed=2), seed=2))
+
+    return WeightedGraph(filePath)
+
+
+def test_serial_matches_bfs(graph):
+    matrix = graph.distance_matrix()
+
+    assert matrix.shape == (len(graph), len(graph))
+    assert matrix_rows(matrix) == hop_rows(graph, matrix.sources, matrix.targets)
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_workers_match_serial(graph, weighted_graph, workers):
+    for tested in (graph, weighted_graph):
+        serial = tested.distance_matrix()
+        parallel = tested.distance_matrix(workers=workers)
+        assert matrix_rows(parallel) == matrix_rows(serial)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_target_subsets(graph, weighted_graph, workers):
+    sources, targets = ["5", "1", "40"], ["60", "2", "5", "2"]
+    matrix = graph.distance_matrix(sources, targets, workers)
+    assert matrix.shape == (3, 4)
+    assert matrix_rows(matrix) == hop_rows(graph, sources, targets)
+
+    tree = weighted_graph.min_distances(7)
+    matrix = weighted_graph.distance_matrix([7], [1, 50, 7], workers)
+    expected = [tree[vertex - 1] for vertex in (1, 50, 7)]
+    assert matrix.row(0) == [inf if value == maxsize else value for value in expected]
+    assert matrix[0, 2] == 0
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_float32(weighted_graph, workers):
+    wide = weighted_graph.distance_matrix()
+    narrow = weighted_graph.distance_matrix(workers=workers, dtype="float32")
+
+    assert narrow.values.format == "f"
+    assert narrow.values.nbytes * 2 == wide.values.nbytes
+    for narrow_row, wide_row in zip(matrix_rows(narrow), matrix_rows(wide)):
+        assert narrow_row == pytest.approx(wide_row, rel=1e-6)
+
+    with pytest.raises(ValueError):
+        weighted_graph.distance_matrix(dtype="float16")
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_file_output(graph, tmp_path, workers):
+    filePath = str(tmp_path / "matrix.bin")
+    matrix = graph.distance_matrix(["1", "2"], workers=workers, filePath=filePath)
+
+    assert matrix_rows(matrix) == matrix_rows(graph.distance_matrix(["1", "2"]))
+    values = array("d")
+    with open(filePath, "rb") as file:
+        values.frombytes(file.read())
+    assert list(values) == matrix.row(0) + matrix.row(1)
+
+
+def test_shared_memory_is_released(graph, weighted_graph, monkeypatch, tmp_path):
+    names = []
+    share = batch._share
+
+    def recorded(values, blocks):
+        spec = share(values, blocks)
+        names.append(spec[1])
+        return spec
+
+    monkeypatch.setattr(batch, "_share", recorded)
+    graph.distance_matrix(workers=2)
+    assert len(names) == 3
+
+    filePath = str(tmp_path / "negative.txt")
+    write_edge_list(filePath, 4, [(1, 2, 1.0), (2, 3, -2.0), (3, 4, 1.0)])
+    with pytest.raises(NegativeCicleError):
+        WeightedGraph(filePath).distance_matrix(workers=2)
+    assert len(names) == 7
+
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_serial_calls_from_threads(graph, weighted_graph, tmp_path):
+    expected = {
+        "graph": matrix_rows(graph.distance_matrix()),
+        "weighted": matrix_rows(weighted_graph.distance_matrix()),
+    }
+    filePath = str(tmp_path / "negative.txt")
+    write_edge_list(filePath, 3, [(1, 2, 1.0), (2, 3, -2.0)])
+    negative = WeightedGraph(filePath)
+
+    def run(call):
+        if call % 3 == 0:
+            return "graph", matrix_rows(graph.distance_matrix())
+        if call % 3 == 1:
+            return "weighted", matrix_rows(weighted_graph.distance_matrix())
+        with pytest.raises(NegativeCicleError):
+            negative.distance_matrix()
+        return None, None
+
+    with ThreadPoolExecutor(4) as executor:
+        for name, rows in executor.map(run, range(24)):
+            if name is not None:
+                assert rows == expected[name]
+    assert not batch._state
@@ -0,0 +1,129 @@
+import pickle
+from os import path
+from random import Random
+from sys import maxsize
+
+import pytest
+
+from bellman_ford import NegativeCicleError, batch_bellman_ford, find_cycle, spfa
+from weighted_graph import WeightedGraph
+
+file_dir = path.dirname(path.abspath(__file__))
+
+
+def directed_graph(vertices, edges, seed):
+    # Edges only go from lower to higher vertices, so negative weights never
+    # close a cycle
+    random = Random(seed)
+    adjacency = [dict() for _ in range(vertices)]
+    for _ in range(edges):
+        vert1, vert2 = sorted(random.sample(range(vertices), 2))
+        adjacency[vert1][vert2] = round(random.uniform(-5, 10), 1)
+
+    return adjacency
+
+
+def bellman_ford(adjacency, start):
+    distances = [maxsize] * len(adjacency)
+    distances[start] = 0
+    for _ in range(len(adjacency) - 1):
+        for vertex, edges in enumerate(adjacency):
+            if distances[vertex] == maxsize:
+                continue
+            for neighbor, weight in edges.items():
+                distances[neighbor] = min(
+                    distances[neighbor], round(distances[vertex] + weight, 1)
+                )
+
+    return distances
+
+
+def edge_arrays(adjacency):
+    edges = [
+        (vertex, neighbor, weight)
+        for vertex, neighbors in enumerate(adjacency)
+        for neighbor, weight in neighbors.items()
+    ]
+    return (
+        [edge[0] for edge in edges],
+        [edge[1] for edge in edges],
+        [edge[2] for edge in edges],
+    )
+
+
+def assert_negative_cycle(adjacency, cycle):
+    assert cycle
+    weight = 0
+    for vert1, vert2 in zip(cycle, cycle[1:] + cycle[:1]):
+        # Cycles are reported 1-based and in the direction of the edges
+        weight += adjacency[vert1 - 1][vert2 - 1]
+    assert weight < 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_spfa_matches_bellman_ford(seed):
+    adjacency = directed_graph(40, 120, seed)
+
+    distances, predecessors = spfa(adjacency, 0)
+
+    assert distances == bellman_ford(adjacency, 0)
+    for vertex, predecessor in enumerate(predecessors):
+        if predecessor is not None:
+            weight = adjacency[predecessor - 1][vertex]
+            assert distances[vertex] == round(distances[predecessor - 1] + weight, 1)
+
+
+def test_spfa_reports_the_negative_cycle():
+    adjacency = directed_graph(30, 80, 7)
+    # 10 -> 20 -> 25 -> 10 weighs -1 in total, other cycles may use it too
+    adjacency[10][20] = 2
+    adjacency[20][25] = 3
+    adjacency[25][10] = -6
+    adjacency[0][10] = 1
+
+    with pytest.raises(NegativeCicleError) as error:
+        spfa(adjacency, 0)
+
+    assert_negative_cycle(adjacency, error.value.cycle)
+
+
+def test_negative_cycle_error_pickles():
+    error = pickle.loads(pickle.dumps(NegativeCicleError([2, 3])))
+    assert error.cycle == [2, 3]
+    assert "[2, 3]" in str(error)
+
+
+def test_find_cycle_on_predecessors():
+    # 0 -> 1 -> 2 -> 3 -> 1, walked back from 0 only reaches it by a scan
+    assert sorted(find_cycle([-1, 3, 1, 2], 0)) == [2, 3, 4]
+    assert find_cycle([-1, 0, 1], 2) is None
+
+
+def test_numpy_engine_matches_spfa():
+    pytest.importorskip("numpy")
+
+    adjacency = directed_graph(40, 120, 3)
+    assert batch_bellman_ford(*edge_arrays(adjacency), 40, 0) == spfa(adjacency, 0)
+
+    adjacency[5][9] = 1
+    adjacency[9][5] = -2
+    adjacency[0][5] = 1
+    with pytest.raises(NegativeCicleError) as error:
+        batch_bellman_ford(*edge_arrays(adjacency), 40, 0)
+    assert_negative_cycle(adjacency, error.value.cycle)
+
+
+@pytest.mark.parametrize("engine", ["spfa", "numpy"])
+def test_undirected_negative_edge_is_a_cycle(engine):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+
+    # in.txt has the undirected edge 1 - 5 weighing -1
+    graph = WeightedGraph(path.join(file_dir, "../in.txt"), negative_engine=engine)
+
+    with pytest.raises(NegativeCicleError) as error:
+        graph.min_distances(2)
+    assert sorted(error.value.cycle) == [1, 5]
+
+    with pytest.raises(NegativeCicleError):
+        graph.distance_matrix()
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from random import Random
+
+import pytest
+
+from bit_matrix import BitMatrix
+from generators import erdos_renyi, write_edge_list
+from graph import Graph
+
+
+def random_mapping(vertices, edges, seed):
+    graph = defaultdict(set)
+    for vertex in range(1, vertices + 1):
+        graph[str(vertex)]
+    for vert1, vert2 in erdos_renyi(vertices, edges, seed):
+        graph[str(vert1)].add(str(vert2))
+        graph[str(vert2)].add(str(vert1))
+
+    return graph
+
+
+def labeled_rows(matrix):
+    return {
+        label: {matrix.labels[vertex] for vertex in matrix.neighbors(idx)}
+        for label, idx in matrix.index.items()
+    }
+
+
+def test_from_mapping():
+    graph = random_mapping(30, 50, 1)
+    matrix = BitMatrix.from_mapping(graph)
+
+    assert labeled_rows(matrix) == graph
+    assert matrix.labels == [str(vertex) for vertex in range(1, 31)]
+    assert matrix.stride == 4
+    for label, idx in matrix.index.items():
+        for other, column in matrix.index.items():
+            assert matrix[idx, column] == (other in graph[label])
+
+
+def test_remove_swaps_in_the_last_vertex():
+    graph = random_mapping(20, 40, 2)
+    graph["20"].add("20")
+    graph["20"].add("3")
+    graph["3"].add("20")
+    matrix = BitMatrix.from_mapping(graph)
+
+    matrix.remove("3")
+    for edges in graph.values():
+        edges.discard("3")
+    del graph["3"]
+
+    # The last vertex took the removed one's row, self loop included
+    assert matrix.index["20"] == 2
+    assert matrix.labels[2] == "20"
+    assert len(matrix) == 19
+    assert "3" not in matrix
+    assert labeled_rows(matrix) == graph
+    assert matrix.row(19) == 0
+
+
+def test_random_updates_match_a_mapping(tmp_path):
+    random = Random(3)
+    graph = random_mapping(10, 15, 3)
+    # File backed, so every growth remaps the file
+    matrix = BitMatrix.from_mapping(graph, str(tmp_path / "matrix.bin"))
+
+    for step in range(300):
+        choice = random.random()
+        if choice < 0.2 and len(graph) > 1:
+            label = random.choice(sorted(graph))
+            matrix.remove(label)
+            for edges in graph.values():
+                edges.discard(label)
+            del graph[label]
+        elif choice < 0.4:
+            label = f"v{step}"
+            matrix.add(label)
+            graph[label] = set()
+        else:
+            vert1, vert2 = random.sample(sorted(graph), 2)
+            linked = random.random() < 0.7
+            matrix.link(matrix.index[vert1], matrix.index[vert2], linked)
+            if linked:
+                graph[vert1].add(vert2)
+                graph[vert2].add(vert1)
+            else:
+                graph[vert1].discard(vert2)
+                graph[vert2].discard(vert1)
+
+        assert labeled_rows(matrix) == graph
+
+    matrix.close()
+
+
+def test_levels_and_components_match_bfs(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 120, erdos_renyi(120, 100, seed=4))
+    graph = Graph(filePath)
+    matrix = BitMatrix.from_mapping(graph.graph)
+
+    for label in matrix.labels[::25]:
+        levels = [
+            sorted(matrix.labels[vertex] for vertex in level)
+            for _, level in matrix.iter_levels(matrix.index[label])
+        ]
+        assert levels == [sorted(level) for _, level in graph.iter_bfs_levels(label)]
+        assert len(list(matrix.iter_levels(matrix.index[label], 1))) <= 2
+
+    components = [
+        sorted(matrix.labels[vertex] for vertex in component)
+        for component in matrix.components()
+    ]
+    assert sorted(components) == sorted(map(sorted, graph.connected_components()))
+
+
+def test_packed_graph_matches_list_matrix(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 40, erdos_renyi(40, 50, seed=5))
+    packed = Graph(filePath, matrix="packed")
+    listed = Graph(filePath, matrix=True)
+
+    for graph in (packed, listed):
+        graph.add_edge("41", "2")
+        graph.remove_edge("1", next(iter(graph.graph["1"])))
+        graph.remove_vertex("7")
+
+    for label in ("2", "41"):
+        assert [sorted(level) for _, level in packed.iter_bfs_levels(label)] == [
+            sorted(level) for _, level in listed.iter_bfs_levels(label)
+        ]
+    assert packed.component_sizes() == listed.component_sizes()
+    assert labeled_rows(packed.matrix_graph) == {
+        vertice: set(edges) for vertice, edges in packed.graph.items()
+    }
+
+
+def test_row_text_and_numpy():
+    graph = {"1": {"2", "3"}, "2": {"1"}, "3": {"1"}}
+    matrix = BitMatrix.from_mapping(graph)
+
+    assert [matrix.row_text(idx) for idx in range(3)] == ["0 1 1 ", "1 0 0 ", "1 0 0 "]
+
+    numpy = pytest.importorskip("numpy")
+    assert numpy.array_equal(
+        matrix.as_numpy(), numpy.array([[0, 1, 1], [1, 0, 0], [1, 0, 0]])
+    )
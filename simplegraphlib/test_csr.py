@@ -0,0 +1,102 @@
+from collections import defaultdict
+
+import pytest
+
+from csr import CSRAdjacency, id_typecode, vertex_sort_key
+from generators import erdos_renyi, write_edge_list
+from graph import Graph
+
+EDGES = [
+    ("b", "10"),
+    ("2", "b"),
+    ("10", "b"),
+    ("a", "a"),
+    ("2", "10"),
+    ("a", "a"),
+    ("b", "2"),
+    ("10", "10"),
+    ("a", "2"),
+]
+
+
+def mapping(edges):
+    graph = defaultdict(set)
+    for vert1, vert2 in edges:
+        graph[vert1].add(vert2)
+        graph[vert2].add(vert1)
+
+    return graph
+
+
+def test_vertex_sort_key():
+    labels = ["b", "10", "a", "2", "-1", "10b"]
+    assert sorted(labels, key=vertex_sort_key) == ["-1", "2", "10", "10b", "a", "b"]
+    assert id_typecode(10) == "i" and id_typecode(2 ** 31) == "q"
+
+
+def test_from_edges_sorts_and_deduplicates():
+    graph = CSRAdjacency.from_edges(EDGES)
+
+    assert graph.labels == ["2", "10", "a", "b"]
+    assert graph.index == {"2": 0, "10": 1, "a": 2, "b": 3}
+    assert [list(graph.neighbors(vertex)) for vertex in range(4)] == [
+        [1, 2, 3],
+        [0, 1, 3],
+        [0, 2],
+        [0, 1],
+    ]
+    assert list(graph.offsets) == [0, 3, 6, 8, 10]
+    assert len(graph.neighbors_array) == 10
+    assert list(graph.degrees()) == [3, 3, 2, 2]
+    assert dict(graph.items()) == {
+        "2": ["10", "a", "b"],
+        "10": ["2", "10", "b"],
+        "a": ["2", "a"],
+        "b": ["2", "10"],
+    }
+
+
+def test_empty_and_missing():
+    graph = CSRAdjacency.from_edges([])
+    assert len(graph) == 0 and list(graph.offsets) == [0]
+    assert graph.components() == []
+
+    graph = CSRAdjacency.from_edges(EDGES)
+    assert "c" not in graph and graph["c"] == set()
+    assert graph.get("c") is None and graph.get("a") == {"2", "a"}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_the_dict_backend(tmp_path, seed):
+    filePath = str(tmp_path / "graph.txt")
+    edges = list(erdos_renyi(60, 120, seed=seed))
+    # Repeats in both directions plus self loops
+    edges += [(vert2, vert1) for vert1, vert2 in edges[::3]] + [(5, 5), (5, 5)]
+    write_edge_list(filePath, 60, edges)
+    csr = Graph(filePath, backend="csr")
+    plain = Graph(filePath)
+
+    expected = mapping((str(vert1), str(vert2)) for vert1, vert2 in edges)
+    assert csr.graph.labels == sorted(expected, key=vertex_sort_key)
+    assert {label: set(row) for label, row in csr.graph.items()} == expected
+    assert {label: set(row) for label, row in plain.graph.items()} == expected
+    for label, row in csr.graph.items():
+        idx = csr.graph.index[label]
+        assert row == sorted(row, key=vertex_sort_key)
+        assert csr.graph.degree(idx) == len(plain.graph[label])
+        assert csr.graph[label] == plain.graph[label]
+
+    assert csr.number_of_edges == plain.number_of_edges
+    assert (csr.min_degree, csr.max_degree, csr.median_degree) == (
+        plain.min_degree,
+        plain.max_degree,
+        plain.median_degree,
+    )
+    assert sorted(map(sorted, csr.connected_components())) == sorted(
+        map(sorted, plain.connected_components())
+    )
+
+    rebuilt = CSRAdjacency.from_mapping(plain.graph)
+    assert rebuilt.labels == csr.graph.labels
+    assert list(rebuilt.offsets) == list(csr.graph.offsets)
+    assert list(rebuilt.neighbors_array) == list(csr.graph.neighbors_array)
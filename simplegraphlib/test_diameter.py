@@ -0,0 +1,89 @@
+from collections import deque
+
+import pytest
+
+from csr import CSRAdjacency
+from diameter import exact_diameter, ifub_diameter, sample_diameter
+from generators import barabasi_albert, erdos_renyi, grid, write_edge_list
+from graph import Graph
+
+
+def edges_of(name, seed):
+    if name == "sparse":
+        # Leaves several components of different diameters
+        return erdos_renyi(120, 100, seed)
+    if name == "scale_free":
+        return barabasi_albert(150, 2, seed)
+    return grid(6, 9, 0.05, seed)
+
+
+def reference_diameter(graph):
+    diameter = 0
+    for source in range(len(graph)):
+        depths = {source: 0}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for neighbor in graph.neighbors(node):
+                if neighbor not in depths:
+                    depths[neighbor] = depths[node] + 1
+                    queue.append(neighbor)
+        diameter = max(diameter, max(depths.values()))
+
+    return diameter
+
+
+@pytest.mark.parametrize("name", ["sparse", "scale_free", "grid"])
+@pytest.mark.parametrize("seed", range(3))
+def test_ifub_matches_exact(name, seed):
+    graph = CSRAdjacency.from_edges(
+        (str(vert1), str(vert2)) for vert1, vert2 in edges_of(name, seed)
+    )
+
+    hops = reference_diameter(graph)
+    assert exact_diameter(graph) == hops
+    assert ifub_diameter(graph) == hops
+
+
+def test_path_graph():
+    graph = CSRAdjacency.from_edges(
+        (str(vertex), str(vertex + 1)) for vertex in range(1, 10)
+    )
+
+    assert ifub_diameter(graph) == exact_diameter(graph) == 9
+    estimate = sample_diameter(graph, 10, seed=1)
+    assert estimate.lower_bound_hops == 9
+    assert estimate.eccentricities == {5: 2, 6: 2, 7: 2, 8: 2, 9: 2}
+    assert estimate.sources == 10
+    # Every ordered pair of the 10 vertices, 330 hops over 90 paths
+    assert estimate.average_path_length == pytest.approx(330 / 90)
+
+
+def test_sample_is_a_lower_bound():
+    graph = CSRAdjacency.from_edges(
+        (str(vert1), str(vert2)) for vert1, vert2 in barabasi_albert(300, 1, seed=4)
+    )
+    hops = exact_diameter(graph)
+
+    for samples in (1, 5, 20):
+        estimate = sample_diameter(graph, samples, seed=samples)
+        assert estimate.sources == samples
+        assert estimate.lower_bound_hops <= hops
+        assert sum(estimate.eccentricities.values()) == samples
+
+    assert sample_diameter(graph, 10, seed=3) == sample_diameter(graph, 10, seed=3)
+    assert sample_diameter(graph, 1000).lower_bound_hops == hops
+
+
+def test_graph_diameter_counts_vertices(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 54, grid(6, 9))
+
+    for backend in ("dict", "csr"):
+        graph = Graph(filePath, backend=backend)
+        # 5 + 8 hops from corner to corner
+        assert graph.diameter() == graph.diameter("ifub") == 14
+        assert graph.diameter_sample(54).lower_bound_hops == 13
+
+    with pytest.raises(ValueError):
+        graph.diameter("approximate")
@@ -0,0 +1,90 @@
+from random import Random
+
+import pytest
+
+from disjoint_set import DisjointSet
+from generators import erdos_renyi, write_edge_list
+from graph import Graph
+
+
+def reference_components(size, edges):
+    labels = list(range(size))
+    for vert1, vert2 in edges:
+        old, new = labels[vert1], labels[vert2]
+        if old != new:
+            labels = [new if label == old else label for label in labels]
+
+    groups = dict()
+    for item, label in enumerate(labels):
+        groups.setdefault(label, []).append(item)
+
+    return sorted(groups.values())
+
+
+def test_unions_match_reference():
+    random = Random(5)
+    components = DisjointSet(50)
+    edges = []
+
+    for _ in range(60):
+        if random.random() < 0.1:
+            components.add()
+        vert1, vert2 = random.choices(range(len(components)), k=2)
+        merged = not components.connected(vert1, vert2)
+        assert components.union(vert1, vert2) == merged
+        edges.append((vert1, vert2))
+
+        groups = reference_components(len(components), edges)
+        assert sorted(components.groups().values()) == groups
+        assert components.count == len(groups)
+        assert components.component_sizes() == sorted(map(len, groups), reverse=True)
+        assert sum(components.size_counts.values()) == components.count
+
+
+def test_empty_and_single():
+    components = DisjointSet()
+    assert len(components) == components.count == 0
+    assert components.component_sizes() == []
+
+    assert components.add() == 0
+    assert components.union(0, 0) is False
+    assert components.component_sizes() == [1]
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+def test_graph_components_match_bfs(tmp_path, backend):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 300, erdos_renyi(300, 220, seed=6))
+    graph = Graph(filePath, backend=backend)
+
+    reached = set()
+    expected = []
+    for vertice in sorted(graph.graph):
+        if vertice not in reached:
+            component = graph.bfs(vertice)
+            reached.update(component)
+            expected.append(sorted(component))
+
+    components = graph.connected_components()
+    assert sorted(map(sorted, components)) == sorted(expected)
+    assert [len(component) for component in components] == graph.component_sizes()
+    assert graph.number_of_components() == len(expected)
+
+
+def test_added_edges_merge_components(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 6, [(1, 2), (3, 4), (5, 6)])
+    graph = Graph(filePath)
+    assert graph.component_sizes() == [2, 2, 2]
+
+    graph.add_edge("2", "3")
+    assert graph.component_sizes() == [4, 2]
+    graph.add_edge("7", "8")
+    assert graph.component_sizes() == [4, 2, 2]
+    graph.add_edge("6", "8")
+    assert graph.connected_components()[0] == ["1", "2", "3", "4"]
+    assert sorted(graph.connected_components()[1]) == ["5", "6", "7", "8"]
+
+    # A removal can split a component, so the sets are rebuilt
+    graph.remove_edge("2", "3")
+    assert graph.component_sizes() == [4, 2, 2]
@@ -1,15 +1,61 @@
-# from graph import Graph
-# from os import path
+from os import path
+from sys import maxsize
 
-# file_dir = path.dirname(path.abspath(__file__))
-# graph = Graph(path.join(file_dir, "../in.txt"))
-# graph.report()
-# graph.bfs_report("1")
-# graph.dfs_report("2")
+import pytest
 
+from generators import erdos_renyi, weighted, write_edge_list
 from weighted_graph import WeightedGraph
-from os import path
 
 file_dir = path.dirname(path.abspath(__file__))
-graph = WeightedGraph(path.join(file_dir, "../in.txt"))
-graph.mst()
+
+
+def test_mst(tmp_path):
+    graph = WeightedGraph(path.join(file_dir, "../in.txt"))
+    output = tmp_path / "mst.txt"
+
+    for algorithm in ("prim", "kruskal"):
+        assert graph.mst(algorithm, str(output)) == pytest.approx(6.4)
+        edges = {
+            tuple(sorted(line.split()))
+            for line in output.read_text().split("\n")
+            if line
+        }
+        assert edges == {("1", "2"), ("1", "5"), ("4", "5"), ("3", "5")}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_heap_dijkstra_matches_dense(tmp_path, seed):
+    filePath = str(tmp_path / "weighted.txt")
+    # 70 vertices but edges only among the first 60, so some are unreachable
+    write_edge_list(filePath, 70, weighted(erdos_renyi(60, 80, seed=seed), seed=seed))
+    sparse = WeightedGraph(filePath, sparse=True)
+    dense = WeightedGraph(filePath, sparse=False)
+    assert dense.graph is not None and sparse.graph is None
+
+    for start in range(1, 71):
+        distances = sparse.min_distances(start)
+        assert distances == dense.min_distances(start)
+        assert distances[start - 1] == 0
+        assert distances[65] == maxsize or start == 66
+
+        for end in (1, 30, 70):
+            path = sparse.shortest_path(start, end)
+            assert path[0] == start or distances[end - 1] == maxsize
+            weight = 0
+            for vert1, vert2 in zip(path, path[1:]):
+                weight = round(weight + sparse.adjacency[vert1 - 1][vert2 - 1], 1)
+            assert weight == (
+                0 if distances[end - 1] == maxsize else distances[end - 1]
+            )
+
+
+if __name__ == "__main__":
+    # from graph import Graph
+
+    # graph = Graph(path.join(file_dir, "../in.txt"))
+    # graph.report()
+    # graph.bfs_report("1")
+    # graph.dfs_report("2")
+
+    graph = WeightedGraph(path.join(file_dir, "../in.txt"))
+    graph.mst()
@@ -0,0 +1,96 @@
+import pytest
+
+from generators import barabasi_albert, weighted, write_edge_list
+from graph import Graph
+from loader import EdgeRows, is_snapshot, read_rows, read_snapshot
+from weighted_graph import WeightedGraph
+
+
+def adjacency_sets(graph):
+    return {vertice: set(edges) for vertice, edges in graph.graph.items()}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 22])
+def test_read_rows_across_chunks(tmp_path, chunk_size):
+    text = "3\n1 2\n\n  2   3 \r\n3 1 0.5\n\n10 20"
+    filePath = tmp_path / "edges.txt"
+    filePath.write_bytes(text.encode())
+
+    rows = list(read_rows(str(filePath), chunk_size))
+
+    assert rows == [["3"], ["1", "2"], ["2", "3"], ["3", "1", "0.5"], ["10", "20"]]
+
+    edge_rows = EdgeRows(str(filePath), chunk_size)
+    assert edge_rows.header == ["3"]
+    assert list(edge_rows) == rows[1:]
+    assert edge_rows.count == 4
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+def test_graph_snapshot_round_trip(tmp_path, backend):
+    edgePath, snapshotPath = str(tmp_path / "graph.txt"), str(tmp_path / "graph.snap")
+    write_edge_list(edgePath, 200, barabasi_albert(200, 3, seed=1))
+    graph = Graph(edgePath, backend=backend)
+    graph.save_snapshot(snapshotPath)
+
+    assert is_snapshot(snapshotPath)
+    assert not is_snapshot(edgePath)
+
+    for snapshot_backend in ("dict", "csr"):
+        loaded = Graph(snapshotPath, backend=snapshot_backend)
+        assert adjacency_sets(loaded) == adjacency_sets(graph)
+        assert loaded.number_of_edges == graph.number_of_edges
+        assert loaded.median_degree == graph.median_degree
+        assert loaded.component_sizes() == graph.component_sizes()
+        assert loaded.shortest_path("1", "200") == graph.shortest_path("1", "200")
+
+
+def test_graph_snapshot_keeps_labels(tmp_path):
+    edgePath, snapshotPath = str(tmp_path / "graph.txt"), str(tmp_path / "graph.snap")
+    with open(edgePath, "w") as file:
+        file.write("4\nlisboa porto\nporto braga\n10 2\n")
+    Graph(edgePath).save_snapshot(snapshotPath)
+
+    loaded = Graph(snapshotPath)
+
+    assert adjacency_sets(loaded) == {
+        "2": {"10"},
+        "10": {"2"},
+        "braga": {"porto"},
+        "lisboa": {"porto"},
+        "porto": {"braga", "lisboa"},
+    }
+    assert loaded.number_of_edges == 3
+
+
+def test_snapshot_arrays_are_mapped(tmp_path):
+    edgePath, snapshotPath = str(tmp_path / "graph.txt"), str(tmp_path / "graph.snap")
+    write_edge_list(edgePath, 50, barabasi_albert(50, 2, seed=2))
+    Graph(edgePath).save_snapshot(snapshotPath)
+
+    snapshot = read_snapshot(snapshotPath)
+
+    assert isinstance(snapshot.arrays["offsets"], memoryview)
+    assert snapshot.arrays["offsets"].readonly
+    assert len(snapshot.arrays["offsets"]) == snapshot.vertices + 1
+    assert len(snapshot.arrays["neighbors"]) == 2 * snapshot.number_of_edges
+
+    with pytest.raises(ValueError):
+        read_snapshot(edgePath)
+
+
+def test_weighted_snapshot_round_trip(tmp_path):
+    edgePath, snapshotPath = str(tmp_path / "graph.txt"), str(tmp_path / "graph.snap")
+    write_edge_list(edgePath, 120, weighted(barabasi_albert(120, 2, seed=3), seed=3))
+    graph = WeightedGraph(edgePath)
+    graph.save_snapshot(snapshotPath)
+
+    loaded = WeightedGraph(snapshotPath)
+
+    assert loaded.vertices == graph.vertices
+    assert loaded.number_of_edges == graph.number_of_edges
+    assert loaded.adjacency == graph.adjacency
+    assert loaded.min_distances(1) == graph.min_distances(1)
+    assert loaded.mst("kruskal", str(tmp_path / "mst.txt")) == pytest.approx(
+        graph.mst("kruskal", str(tmp_path / "mst.txt"))
+    )
@@ -0,0 +1,171 @@
+import statistics
+from random import Random
+
+import pytest
+
+from degree_stats import DegreeHistogram
+from generators import erdos_renyi, weighted, write_edge_list
+from graph import Graph
+from weighted_graph import WeightedGraph
+
+
+def degree_stats(graph):
+    return (
+        graph.min_degree,
+        graph.max_degree,
+        graph.med_degree,
+        graph.median_degree,
+        graph.number_of_edges,
+    )
+
+
+def test_degree_histogram_matches_statistics():
+    random = Random(3)
+    degrees = [random.randrange(6) for _ in range(40)]
+    histogram = DegreeHistogram(degrees)
+
+    for _ in range(500):
+        if degrees and random.random() < 0.4:
+            degree = degrees.pop(random.randrange(len(degrees)))
+            histogram.remove(degree)
+        elif degrees and random.random() < 0.5:
+            idx = random.randrange(len(degrees))
+            # Past the initial capacity, so the tree has to grow
+            new = random.randrange(40)
+            histogram.move(degrees[idx], new)
+            degrees[idx] = new
+        else:
+            degrees.append(random.randrange(40))
+            histogram.add(degrees[-1])
+
+        assert len(histogram) == len(degrees)
+        if degrees:
+            assert histogram.min == min(degrees)
+            assert histogram.max == max(degrees)
+            assert histogram.mean == statistics.mean(degrees)
+            assert histogram.median == statistics.median(degrees)
+
+
+def test_degree_histogram_rejects_missing_degree():
+    histogram = DegreeHistogram([1, 2])
+    with pytest.raises(ValueError):
+        histogram.remove(3)
+    with pytest.raises(ValueError):
+        histogram.remove(10)
+
+    empty = DegreeHistogram()
+    assert (empty.min, empty.max, empty.mean, empty.median) == (0, 0, 0, 0)
+
+
+def test_graph_mutations_match_a_reload(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 30, erdos_renyi(30, 60, seed=1))
+    graph = Graph(filePath)
+    random = Random(1)
+
+    for _ in range(200):
+        vert1, vert2 = map(str, random.sample(range(1, 36), 2))
+        if random.random() < 0.5:
+            graph.add_edge(vert1, vert2)
+        elif random.random() < 0.8:
+            graph.remove_edge(vert1, vert2)
+        else:
+            graph.remove_vertex(vert1)
+        # Queried between changes so the union-find is kept incrementally
+        graph.component_sizes()
+
+    edges = {
+        tuple(sorted((vert1, vert2)))
+        for vert1 in graph.graph
+        for vert2 in graph.graph[vert1]
+    }
+    write_edge_list(filePath, len(graph), edges)
+    reloaded = Graph(filePath)
+    for vertice in graph.graph:
+        reloaded.add_vertex(vertice)
+
+    assert degree_stats(graph) == degree_stats(reloaded)
+    assert graph.component_sizes() == reloaded.component_sizes()
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+def test_repeated_rows_count_once(tmp_path, backend):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 3, [(1, 2), (2, 1), (1, 2), (3, 3), (3, 3), (2, 3)])
+    graph = Graph(filePath, backend=backend)
+
+    assert graph.number_of_edges == 3
+    snapshotPath = str(tmp_path / "graph.snap")
+    graph.save_snapshot(snapshotPath)
+    assert Graph(snapshotPath).number_of_edges == 3
+
+    if backend == "dict":
+        graph.remove_edge("1", "2")
+        graph.remove_edge("1", "2")
+        assert graph.number_of_edges == 2
+        graph.remove_vertex("3")
+        assert graph.number_of_edges == 0
+
+
+def test_weighted_mutations_match_a_reload(tmp_path):
+    filePath = str(tmp_path / "weighted.txt")
+    write_edge_list(filePath, 20, weighted(erdos_renyi(20, 40, seed=2), seed=2))
+    graph = WeightedGraph(filePath)
+    graph.apply(
+        [
+            ("add_edge", 3, 22, 1.5),
+            ("add_edge", 1, 2, 0),
+            ("remove_vertex", 5),
+            ("remove_edge", 3, 4),
+            ("add_vertex",),
+        ]
+    )
+
+    edges = [
+        (vertex + 1, neighbor + 1, weight)
+        for vertex, neighbors in enumerate(graph.adjacency)
+        for neighbor, weight in neighbors.items()
+        if vertex < neighbor
+    ]
+    write_edge_list(filePath, graph.vertices, edges)
+    reloaded = WeightedGraph(filePath)
+
+    assert degree_stats(graph) == degree_stats(reloaded)
+    assert graph.min_distances(1) == reloaded.min_distances(1)
+
+
+def test_weighted_rejects_vertices_out_of_range(tmp_path):
+    filePath = str(tmp_path / "weighted.txt")
+    write_edge_list(filePath, 4, [(1, 2, 1.0), (2, 3, 2.0), (3, 4, 1.0)])
+    graph = WeightedGraph(filePath)
+    before = [dict(edges) for edges in graph.adjacency]
+
+    for vert1, vert2 in ((0, 1), (-1, 2), (1, 5)):
+        with pytest.raises(ValueError):
+            graph.remove_edge(vert1, vert2)
+    for vert1, vert2 in ((0, 1), (2, -3)):
+        with pytest.raises(ValueError):
+            graph.add_edge(vert1, vert2, 1.0)
+    with pytest.raises(ValueError):
+        graph.remove_vertex(0)
+
+    assert graph.adjacency == before
+    assert graph.vertices == 4
+
+
+def test_list_matrix_rejects_labels_without_a_row(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 3, [(1, 2), (2, 3)])
+    graph = Graph(filePath, matrix=True)
+
+    for vert1, vert2 in (("x", "1"), ("1", "0")):
+        with pytest.raises(ValueError):
+            graph.add_edge(vert1, vert2)
+    with pytest.raises(ValueError):
+        graph.add_vertex("x")
+
+    assert sorted(graph.graph) == ["1", "2", "3"]
+    assert graph.number_of_edges == 2
+
+    with pytest.raises(TypeError):
+        Graph(filePath, backend="csr").add_edge("1", "3")
@@ -0,0 +1,130 @@
+from heapq import heappop, heappush
+from math import inf
+from random import Random
+from sys import maxsize
+
+import pytest
+
+from generators import erdos_renyi, grid, weighted, write_edge_list
+from graph import Graph
+from point_to_point import astar, bidirectional_bfs, bidirectional_dijkstra
+from weighted_graph import WeightedGraph
+
+COLUMNS = 12
+
+
+def random_adjacency(vertices, edges, seed):
+    adjacency = [dict() for _ in range(vertices)]
+    for vert1, vert2, weight in weighted(erdos_renyi(vertices, edges, seed), seed=seed):
+        adjacency[vert1 - 1][vert2 - 1] = adjacency[vert2 - 1][vert1 - 1] = weight
+
+    return adjacency
+
+
+def dijkstra(adjacency, start):
+    distances = [inf] * len(adjacency)
+    distances[start] = 0
+    heap = [(0, start)]
+    while heap:
+        distance, node = heappop(heap)
+        if distance > distances[node]:
+            continue
+        for neighbor, weight in adjacency[node].items():
+            if round(distance + weight, 1) < distances[neighbor]:
+                distances[neighbor] = round(distance + weight, 1)
+                heappush(heap, (distances[neighbor], neighbor))
+
+    return distances
+
+
+def path_weight(adjacency, path):
+    total = 0
+    for vert1, vert2 in zip(path, path[1:]):
+        total = round(total + adjacency[vert1][vert2], 1)
+
+    return total
+
+
+def manhattan(vertex, goal):
+    return abs(vertex // COLUMNS - goal // COLUMNS) + abs(
+        vertex % COLUMNS - goal % COLUMNS
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_bidirectional_bfs_finds_shortest_paths(seed):
+    adjacency = random_adjacency(80, 110, seed)
+    neighbors = lambda vertex: adjacency[vertex].keys()
+    depths = dijkstra([{neighbor: 1 for neighbor in edges} for edges in adjacency], 0)
+
+    for goal in range(80):
+        path = bidirectional_bfs(0, goal, neighbors)
+        if depths[goal] == inf:
+            assert path == []
+            continue
+
+        assert path[0] == 0 and path[-1] == goal
+        assert len(path) == depths[goal] + 1
+        assert all(vert2 in adjacency[vert1] for vert1, vert2 in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_bidirectional_dijkstra_matches_dijkstra(seed):
+    adjacency = random_adjacency(80, 160, seed)
+    distances = dijkstra(adjacency, 3)
+
+    for goal in range(80):
+        distance, path = bidirectional_dijkstra(3, goal, adjacency)
+        assert distance == distances[goal]
+        if distance == inf:
+            assert path == []
+        else:
+            assert path[0] == 3 and path[-1] == goal
+            assert path_weight(adjacency, path) == distance
+
+
+def test_astar_on_a_grid():
+    adjacency = [dict() for _ in range(COLUMNS * 8)]
+    # No shortcuts and every weight at least 1, so the lattice distance never
+    # overestimates
+    for vert1, vert2, weight in weighted(grid(8, COLUMNS), 1, 5, seed=2):
+        adjacency[vert1 - 1][vert2 - 1] = adjacency[vert2 - 1][vert1 - 1] = weight
+    distances = dijkstra(adjacency, 0)
+
+    for goal in Random(2).sample(range(len(adjacency)), 20):
+        distance, path = astar(0, goal, adjacency, manhattan)
+        assert distance == distances[goal]
+        assert path_weight(adjacency, path) == distance
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+def test_graph_shortest_path(tmp_path, backend):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 24, grid(4, 6))
+    graph = Graph(filePath, backend=backend)
+
+    path = graph.shortest_path("1", "24")
+    assert len(path) == 9 and path[0] == "1" and path[-1] == "24"
+    assert all(vert2 in graph.graph[vert1] for vert1, vert2 in zip(path, path[1:]))
+    assert graph.shortest_path("5", "5") == ["5"]
+    assert graph.shortest_path("1", "99") == []
+
+
+def test_weighted_queries_agree_with_the_cached_tree(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 60, weighted(erdos_renyi(60, 70, seed=4), seed=4))
+    graph = WeightedGraph(filePath)
+    # Without a cache every query is a bidirectional search
+    uncached = WeightedGraph(filePath, cache_size=0)
+    tree = uncached.min_distances(1)
+
+    for end in range(1, 61):
+        distance = graph.min_distance(1, end)
+        assert distance == uncached.min_distance(1, end) == tree[end - 1]
+        assert graph.shortest_path(1, end, lambda vertex, goal: 0)[-1] == end
+        if distance == maxsize:
+            assert graph.shortest_path(1, end) == [end]
+
+    # The start repeated, so its whole tree was built once and reused
+    stats = graph.cache.stats()
+    assert stats["entries"] == 1 and stats["hits"] > 100
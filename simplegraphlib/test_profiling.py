@@ -0,0 +1,134 @@
+import json
+from io import StringIO
+from sys import maxsize
+
+from generators import erdos_renyi, weighted, write_edge_list
+from graph import Graph
+from profiling import NULL_PROFILER, Profiler
+from weighted_graph import WeightedGraph
+
+
+def test_profiler_and_null_profiler():
+    profiler = Profiler()
+    with profiler.phase("parse"):
+        profiler.count("relaxations", 3)
+    with profiler.phase("parse"):
+        profiler.count("relaxations")
+
+    report = profiler.as_dict()
+    assert report["phases"]["parse"]["calls"] == 2
+    assert report["phases"]["parse"]["seconds"] >= 0
+    assert report["counters"] == {"relaxations": 4}
+    assert json.loads(profiler.to_json()) == report
+
+    profiler.reset()
+    assert profiler.as_dict() == {"phases": {}, "counters": {}}
+
+    with NULL_PROFILER.phase("parse"):
+        NULL_PROFILER.count("relaxations", 3)
+    assert not NULL_PROFILER.enabled
+    assert NULL_PROFILER.as_dict() == {"phases": {}, "counters": {}}
+    assert json.loads(NULL_PROFILER.to_json()) == NULL_PROFILER.as_dict()
+
+
+def test_graph_phases_and_counters(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 80, erdos_renyi(80, 100, seed=1))
+    graph = Graph(filePath, matrix=True, profile=True)
+    assert set(graph.stats()["phases"]) == {
+        "parse",
+        "degree_stats",
+        "matrix_conversion",
+    }
+
+    visited = graph.bfs("1")
+    counters = graph.stats()["counters"]
+    assert counters["vertices_popped"] == len(visited)
+    assert counters["edges_scanned"] == sum(len(graph.graph[node]) for node in visited)
+
+    graph.report(StringIO())
+    graph.connected_components()
+    graph.distance_matrix(["1"])
+    graph.diameter()
+    stats = graph.stats()
+    assert {"traversal", "output", "components", "distance_matrix", "diameter"} <= set(
+        stats["phases"]
+    )
+    assert stats["phases"]["parse"]["calls"] == 1
+    assert stats["counters"]["bfs_runs"] >= 1
+    assert stats["counters"]["vertices_popped"] > len(visited)
+    assert json.loads(graph.profiler.to_json()) == stats
+
+
+def test_graph_profile_context(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 80, erdos_renyi(80, 100, seed=1))
+    graph = Graph(filePath)
+
+    # Off by default, and nothing is recorded
+    graph.bfs("1")
+    assert graph.profiler is NULL_PROFILER
+    assert graph.stats() == {"phases": {}, "counters": {}}
+
+    with graph.profile() as profiler:
+        visited = graph.dfs("1")
+        graph.shortest_path("1", visited[-1])
+    assert graph.profiler is NULL_PROFILER
+    assert graph.stats() == {"phases": {}, "counters": {}}
+
+    report = json.loads(profiler.to_json())
+    assert list(report["phases"]) == ["traversal"]
+    assert report["counters"]["vertices_popped"] >= len(visited)
+    assert report["counters"]["edges_scanned"] > 0
+
+
+def test_weighted_phases_and_counters(tmp_path):
+    filePath = str(tmp_path / "weighted.txt")
+    write_edge_list(filePath, 60, weighted(erdos_renyi(60, 90, seed=2), seed=2))
+    graph = WeightedGraph(filePath, sparse=True, profile=True)
+    assert list(graph.stats()["phases"]) == ["parse"]
+
+    distances = graph.min_distances(1)
+    reached = [
+        vertex for vertex, distance in enumerate(distances) if distance != maxsize
+    ]
+    counters = graph.stats()["counters"]
+    assert counters["vertices_popped"] == len(reached)
+    assert counters["edges_scanned"] == sum(
+        len(graph.adjacency[vertex]) for vertex in reached
+    )
+    assert counters["heap_pushes"] == counters["relaxations"] + 1
+    assert graph.stats()["phases"]["relaxation"]["calls"] == 1
+
+    # Served from the cache, so only the hit is recorded
+    graph.min_distances(1)
+    stats = graph.stats()
+    assert stats["counters"] == counters
+    assert stats["cache"]["hits"] == 1
+
+    graph.mst("prim", StringIO())
+    graph.save_snapshot(str(tmp_path / "weighted.snap"))
+    stats = graph.stats()
+    assert {"mst", "output"} <= set(stats["phases"])
+    assert stats["counters"]["heap_pops"] > 0
+
+    dense = WeightedGraph(filePath, sparse=False, profile=True)
+    assert list(dense.stats()["phases"]) == ["parse", "matrix_conversion"]
+
+
+def test_weighted_profile_context(tmp_path):
+    filePath = str(tmp_path / "weighted.txt")
+    write_edge_list(filePath, 60, weighted(erdos_renyi(60, 90, seed=2), seed=2))
+    graph = WeightedGraph(filePath)
+
+    graph.min_distances(1)
+    assert graph.stats()["phases"] == {} and graph.stats()["counters"] == {}
+
+    with graph.profile() as profiler:
+        graph.min_distance(2, 30)
+    assert graph.stats()["counters"] == {}
+
+    report = json.loads(profiler.to_json())
+    assert list(report["phases"]) == ["relaxation"]
+    assert report["counters"]["vertices_popped"] > 0
+    assert report["counters"]["relaxations"] > 0
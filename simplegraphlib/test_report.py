@@ -0,0 +1,130 @@
+import json
+from io import StringIO
+from os import path
+
+import pytest
+
+from generators import erdos_renyi, write_edge_list
+from graph import Graph
+from report import WRITE_BATCH, ReportWriter
+from weighted_graph import WeightedGraph
+
+file_dir = path.dirname(path.abspath(__file__))
+
+
+def write_sample(target, format):
+    with ReportWriter(target, format) as writer:
+        writer.rows(
+            "edges",
+            ({"vertex": vertex, "degree": vertex % 3} for vertex in range(3)),
+            lambda row: f"{row['vertex']}: {row['degree']}",
+        )
+        writer.blank()
+        writer.stats("totals", {"count": 3}, lambda stats: [f"Count: {stats['count']}"])
+        writer.rows("empty", iter(()), str)
+
+
+def test_text_format():
+    output = StringIO()
+    write_sample(output, "text")
+
+    assert output.getvalue() == "0: 0\n1: 1\n2: 2\n\nCount: 3\n"
+    # A caller's file is flushed, not closed
+    assert not output.closed
+
+
+def test_json_format(tmp_path):
+    filePath = str(tmp_path / "report.json")
+    write_sample(filePath, "json")
+
+    with open(filePath) as file:
+        assert json.load(file) == {
+            "edges": [
+                {"vertex": 0, "degree": 0},
+                {"vertex": 1, "degree": 1},
+                {"vertex": 2, "degree": 2},
+            ],
+            "totals": {"count": 3},
+            "empty": [],
+        }
+
+
+def test_ndjson_format():
+    output = StringIO()
+    write_sample(output, "ndjson")
+
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == [
+        {"section": "edges", "vertex": 0, "degree": 0},
+        {"section": "edges", "vertex": 1, "degree": 1},
+        {"section": "edges", "vertex": 2, "degree": 2},
+        {"section": "totals", "count": 3},
+    ]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        ReportWriter(StringIO(), "xml")
+
+
+@pytest.mark.parametrize("format", ["text", "json", "ndjson"])
+def test_rows_beyond_one_batch(tmp_path, format):
+    filePath = str(tmp_path / "report")
+    rows = 3 * WRITE_BATCH + 7
+    with ReportWriter(filePath, format, buffer_size=64) as writer:
+        writer.rows(
+            "numbers", ({"n": n} for n in range(rows)), lambda row: str(row["n"])
+        )
+
+    with open(filePath) as file:
+        text = file.read()
+    if format == "text":
+        numbers = [int(line) for line in text.splitlines()]
+    elif format == "json":
+        numbers = [row["n"] for row in json.loads(text)["numbers"]]
+    else:
+        numbers = [json.loads(line)["n"] for line in text.splitlines()]
+    assert numbers == list(range(rows))
+
+
+def test_graph_report_formats(tmp_path):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 50, erdos_renyi(50, 40, seed=1))
+    graph = Graph(filePath)
+
+    text, machine = StringIO(), StringIO()
+    graph.report(text)
+    graph.report(machine, format="json")
+    report = json.loads(machine.getvalue())
+
+    assert list(report) == ["adjacency", "degrees", "components", "component_vertices"]
+    assert report["degrees"]["edges"] == graph.number_of_edges
+    assert report["components"]["sizes"] == graph.component_sizes()
+    assert len(report["adjacency"]) == len(graph)
+    assert f"Number of edges: {graph.number_of_edges}\n" in text.getvalue()
+    assert (
+        f"Number of Connected Components: {graph.number_of_components()}\n"
+        in text.getvalue()
+    )
+
+    lines = StringIO()
+    graph.report(lines, sections=["components"], format="ndjson")
+    assert json.loads(lines.getvalue()) == {
+        "section": "components",
+        "count": graph.number_of_components(),
+        "sizes": graph.component_sizes(),
+    }
+
+    with pytest.raises(ValueError):
+        graph.report(StringIO(), sections=["everything"])
+
+
+def test_mst_report():
+    graph = WeightedGraph(path.join(file_dir, "../in.txt"))
+    output = StringIO()
+
+    total = graph.mst("kruskal", output, "json")
+
+    report = json.loads(output.getvalue())
+    assert report["total"] == {"weight": total}
+    assert sum(edge["weight"] for edge in report["edges"]) == pytest.approx(total)
+    assert len(report["edges"]) == graph.vertices - 1
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import socket
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from client import GraphClient, QueryError
+from generators import erdos_renyi, weighted, write_edge_list
+from graph import Graph
+from server import GraphServer, GraphSpec, parse_spec
+from weighted_graph import WeightedGraph
+
+
+@contextmanager
+def running(specs, filePath=None, **options):
+    ready = threading.Event()
+    box = dict()
+
+    async def main():
+        daemon = GraphServer(specs, **options)
+        server = await daemon.start(filePath)
+        box["address"] = server.sockets[0].getsockname()
+        box["stop"] = asyncio.Event()
+        box["loop"] = asyncio.get_running_loop()
+        ready.set()
+        await box["stop"].wait()
+        await daemon.close()
+
+    thread = threading.Thread(target=asyncio.run, args=(main(),))
+    thread.start()
+    try:
+        assert ready.wait(30)
+        yield box["address"]
+    finally:
+        if "loop" in box:
+            box["loop"].call_soon_threadsafe(box["stop"].set)
+        thread.join()
+
+
+def connect(address, timeout=30):
+    if isinstance(address, str):
+        return GraphClient(address, timeout=timeout)
+
+    return GraphClient(host=address[0], port=address[1], timeout=timeout)
+
+
+@pytest.fixture
+def specs(tmp_path):
+    graphPath, weightedPath = str(tmp_path / "graph.txt"), str(tmp_path / "w.txt")
+    write_edge_list(graphPath, 60, erdos_renyi(60, 90, seed=1))
+    write_edge_list(weightedPath, 40, weighted(erdos_renyi(40, 70, seed=2), seed=2))
+
+    return {
+        "roads": GraphSpec("graph", graphPath),
+        "costs": GraphSpec("weighted", weightedPath),
+    }
+
+
+def check_queries(client, specs):
+    graph = Graph(specs["roads"].filePath)
+    costs = WeightedGraph(specs["costs"].filePath)
+
+    assert client.call("roads", "neighbors", vertex="1") == sorted(
+        graph.graph["1"], key=int
+    )
+    assert client.call("roads", "neighbors", vertex="missing") == []
+    assert client.call("roads", "degrees") == {
+        "vertices": len(graph),
+        "edges": graph.number_of_edges,
+        "min": graph.min_degree,
+        "max": graph.max_degree,
+        "mean": graph.med_degree,
+        "median": graph.median_degree,
+    }
+    assert sorted(client.call("roads", "bfs", start="1")) == sorted(graph.bfs("1"))
+    assert client.call("roads", "dfs", start="1")[0] == "1"
+    path = client.call("roads", "shortest_path", start="1", goal="30")
+    assert len(path) == len(graph.shortest_path("1", "30"))
+    distances = client.call("roads", "distances", start="1")
+    assert distances["1"] == 0
+    assert len(path) == (distances["30"] + 1 if "30" in distances else 0)
+    assert client.call("roads", "component_sizes") == graph.component_sizes()
+    assert sorted(map(sorted, client.call("roads", "components"))) == sorted(
+        map(sorted, graph.connected_components())
+    )
+
+    assert client.call("costs", "neighbors", vertex=2) == {
+        str(neighbor + 1): weight for neighbor, weight in costs.adjacency[1].items()
+    }
+    assert client.call("costs", "degrees")["edges"] == costs.number_of_edges
+    assert client.call("costs", "distances", start=1) == costs.min_distances(1)
+    assert client.call("costs", "distance", start=1, end=30) == costs.min_distance(
+        1, 30
+    )
+    assert client.call("costs", "shortest_path", start=1, end=30) == (
+        costs.shortest_path(1, 30)
+    )
+    mst = client.call("costs", "mst", algorithm="kruskal")
+    assert len(mst["edges"]) <= costs.vertices - 1
+    assert sum(edge["weight"] for edge in mst["edges"]) == pytest.approx(
+        mst["total"]["weight"]
+    )
+
+
+def check_errors(client):
+    for graph, method, params, message in (
+        ("nowhere", "bfs", {"start": "1"}, "Unknown graph"),
+        ("roads", "mst", {}, "Unknown method"),
+        ("costs", "bfs", {"start": 1}, "Unknown method"),
+        ("costs", "neighbors", {"vertex": 0}, "not in the graph"),
+    ):
+        with pytest.raises(QueryError) as error:
+            client.call(graph, method, **params)
+        assert error.value.type == "ValueError"
+        assert message in str(error.value)
+
+    with pytest.raises(QueryError) as error:
+        client.call("roads", "bfs", origin="1")
+    assert error.value.type == "TypeError"
+
+    # The connection is still usable after errors
+    assert client.call("roads", "distances", start="1")["1"] == 0
+
+
+@pytest.mark.parametrize("workers", [None, 3])
+def test_tcp(specs, workers):
+    with running(specs, workers=workers) as address:
+        assert address[1] > 0
+        with connect(address) as client:
+            check_queries(client, specs)
+            check_errors(client)
+
+
+def test_unix_socket(specs, tmp_path):
+    filePath = str(tmp_path / "graphs.sock")
+    with running(specs, filePath) as address:
+        assert address == filePath
+        with connect(address) as client:
+            check_queries(client, specs)
+            check_errors(client)
+
+
+def test_processes(specs, tmp_path):
+    filePath = str(tmp_path / "graphs.sock")
+    with running(specs, filePath, workers=2, processes=True) as address:
+        with connect(address) as client:
+            check_queries(client, specs)
+            check_errors(client)
+
+
+def test_pipelined_requests(specs):
+    requests = [
+        {"id": 1, "graph": "costs", "method": "distances", "params": {"start": 1}},
+        {
+            "id": "two",
+            "graph": "roads",
+            "method": "neighbors",
+            "params": {"vertex": "1"},
+        },
+        {"id": 3, "graph": "roads", "method": "walk"},
+        {"id": 4, "graph": "costs", "method": "mst"},
+        {"id": 5, "graph": "roads", "method": "component_sizes"},
+    ]
+
+    with running(specs, workers=2) as address, socket.create_connection(
+        address, 30
+    ) as connection:
+        connection.sendall(
+            b"".join(json.dumps(request).encode() + b"\n" for request in requests)
+            + b"not json\n"
+        )
+        file = connection.makefile("rb")
+        responses = [json.loads(file.readline()) for _ in range(len(requests) + 1)]
+
+    by_id = {response["id"]: response for response in responses}
+    assert sorted(by_id, key=str) == [1, 3, 4, 5, None, "two"]
+    assert by_id[1]["result"] == WeightedGraph(specs["costs"].filePath).min_distances(1)
+    assert by_id["two"]["result"] == sorted(
+        Graph(specs["roads"].filePath).graph["1"], key=int
+    )
+    assert by_id[3]["error"]["type"] == "ValueError"
+    assert "total" in by_id[4]["result"]
+    assert by_id[None]["error"]["type"] == "JSONDecodeError"
+
+
+def test_parse_spec():
+    assert parse_spec("graph", "roads=/data/roads.txt", {"backend": "csr"}) == (
+        "roads",
+        GraphSpec("graph", "/data/roads.txt", {"backend": "csr"}),
+    )
+    with pytest.raises(ValueError):
+        parse_spec("graph", "/data/roads.txt")
+    with pytest.raises(ValueError):
+        GraphServer({"roads": GraphSpec("tree", "/data/roads.txt")})
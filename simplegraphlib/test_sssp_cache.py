@@ -0,0 +1,136 @@
+from math import inf
+from sys import maxsize
+
+import pytest
+
+from generators import erdos_renyi, weighted, write_edge_list
+from sssp_cache import ShortestPathCache, ShortestPathTree
+from weighted_graph import WeightedGraph
+
+VERTICES = 40
+# float64 distances plus int64 predecessors
+TREE_BYTES = 16 * VERTICES
+
+
+@pytest.fixture
+def filePath(tmp_path):
+    filePath = str(tmp_path / "weighted.txt")
+    write_edge_list(
+        filePath, VERTICES, weighted(erdos_renyi(VERTICES, 60, seed=1), seed=1)
+    )
+
+    return filePath
+
+
+def tree(start, vertices=VERTICES):
+    return ShortestPathTree(start, [0] * vertices, [None] * vertices)
+
+
+def test_tree_round_trip():
+    distances = [0, 2.5, maxsize, 4.0]
+    result = ShortestPathTree(1, distances, [None, 1, None, 2])
+
+    assert list(result.distances) == [0, 2.5, inf, 4.0]
+    assert result.distance_list() == distances
+    assert result.distance(3) == maxsize
+    assert result.path(4) == [1, 2, 4]
+    assert result.path(3) == [3]
+    assert result.nbytes() == 64
+
+
+def test_least_recently_used_is_evicted(filePath):
+    graph = WeightedGraph(filePath, cache_size=2)
+
+    for start in (1, 2, 3, 1, 4):
+        graph.min_distances(start)
+
+    assert list(graph.cache.entries) == [1, 4]
+    assert graph.cache.stats() == {
+        "entries": 2,
+        "bytes": 2 * TREE_BYTES,
+        "hits": 0,
+        "misses": 5,
+        "evictions": 3,
+    }
+
+    # A hit makes the start the most recently used
+    graph.min_distances(1)
+    graph.min_distances(5)
+    assert list(graph.cache.entries) == [1, 5]
+    assert graph.cache.hits == 1
+
+
+def test_put_replaces_a_start():
+    cache = ShortestPathCache(2)
+    cache.put(tree(1))
+    cache.put(tree(2))
+    cache.put(tree(1, 10))
+
+    assert list(cache.entries) == [2, 1]
+    assert cache.bytes == TREE_BYTES + 160
+    assert cache.evictions == 0
+
+
+def test_bytes_limit(filePath):
+    graph = WeightedGraph(filePath, cache_size=10, cache_bytes=3 * TREE_BYTES - 1)
+
+    for start in range(1, 6):
+        graph.min_distances(start)
+
+    assert list(graph.cache.entries) == [4, 5]
+    assert graph.cache.bytes == 2 * TREE_BYTES
+    assert graph.cache.evictions == 3
+
+    # A tree larger than the whole budget is never stored
+    small = WeightedGraph(filePath, cache_bytes=TREE_BYTES - 1)
+    assert small.min_distances(1) == graph.min_distances(1)
+    assert len(small.cache) == 0 and small.cache.evictions == 0
+
+
+def test_disabled_cache(filePath):
+    graph = WeightedGraph(filePath, cache_size=0)
+    cached = WeightedGraph(filePath)
+
+    for _ in range(3):
+        assert graph.min_distances(2) == cached.min_distances(2)
+        for end in (1, 20, 40):
+            assert graph.min_distance(2, end) == cached.min_distance(2, end)
+            assert graph.shortest_path(2, end)[-1] == end
+
+    stats = graph.stats()["cache"]
+    # Every lookup misses and nothing is stored, so nothing is evicted either
+    assert stats["misses"] > 0
+    assert {**stats, "misses": 0} == dict.fromkeys(stats, 0)
+
+
+@pytest.mark.parametrize("change", ["add_edge", "remove_edge", "remove_vertex"])
+def test_changes_clear_the_cache(filePath, tmp_path, change):
+    graph = WeightedGraph(filePath)
+    neighbor = min(graph.adjacency[0]) + 1
+    arguments = {
+        "add_edge": (1, 40, 0.5),
+        "remove_edge": (1, neighbor),
+        "remove_vertex": (neighbor,),
+    }[change]
+    for start in (1, 2):
+        graph.min_distances(start)
+    assert len(graph.cache) == 2
+    hits = graph.cache.hits
+
+    graph.apply([(change, *arguments)])
+
+    assert len(graph.cache) == 0 and graph.cache.bytes == 0
+    # Counters survive a clear, they describe the whole run
+    assert graph.cache.hits == hits and graph.cache.misses == 2
+
+    edges = [
+        (vertex + 1, neighbor + 1, weight)
+        for vertex, neighbors in enumerate(graph.adjacency)
+        for neighbor, weight in neighbors.items()
+        if vertex < neighbor
+    ]
+    reloadPath = str(tmp_path / "reloaded.txt")
+    write_edge_list(reloadPath, graph.vertices, edges)
+    reloaded = WeightedGraph(reloadPath)
+    for start in (1, 2):
+        assert graph.min_distances(start) == reloaded.min_distances(start)
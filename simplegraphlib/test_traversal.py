@@ -0,0 +1,132 @@
+from io import StringIO
+from itertools import islice
+
+import pytest
+
+from generators import erdos_renyi, write_edge_list
+from graph import Graph
+
+# 1-2-3-4-5-6 with 7 hanging off 3
+CHAIN = [(1, 2), (2, 3), (3, 4), (4, 5), (5, 6), (3, 7)]
+CHAIN_REPORT = (
+    "Level 0: 1\n"
+    "Level 1, Father 1: 2 \n"
+    "Level 2, Father 2: 3 \n"
+    "Level 3, Father 3: 4 7 \n"
+    "Level 4, Father 4: 5 \n"
+    "Level 5, Father 5: 6 \n"
+)
+
+
+def sorted_children(report):
+    lines = []
+    for line in report.splitlines():
+        head, _, children = line.partition(": ")
+        lines.append(f"{head}: " + " ".join(sorted(children.split())))
+
+    return lines
+
+
+@pytest.fixture
+def chain(tmp_path):
+    filePath = str(tmp_path / "chain.txt")
+    write_edge_list(filePath, 7, CHAIN)
+
+    return filePath
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+@pytest.mark.parametrize("report", ["bfs_report", "dfs_report"])
+def test_reports_are_written_root_first(chain, backend, report):
+    output = StringIO()
+    getattr(Graph(chain, backend=backend), report)("1", filePath=output)
+
+    # Siblings follow set order on the dict backend
+    assert sorted_children(output.getvalue()) == sorted_children(CHAIN_REPORT)
+    if backend == "csr" or report == "dfs_report":
+        assert output.getvalue() == CHAIN_REPORT
+
+
+def test_report_max_depth_and_default_path(chain, tmp_path, monkeypatch):
+    graph = Graph(chain)
+    output = StringIO()
+    graph.dfs_report("3", max_depth=1, filePath=output)
+    assert output.getvalue() == "Level 0: 3\nLevel 1, Father 3: 2 4 7 \n"
+
+    monkeypatch.chdir(tmp_path)
+    graph.spanning_tree("6", graph.dfs)
+    with open(tmp_path / "dfs.txt") as file:
+        assert file.read().splitlines()[-1] == "Level 5, Father 2: 1 "
+
+    with pytest.raises(ValueError):
+        graph.spanning_tree("1", "walk")
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+def test_bfs_report_follows_the_traversal(tmp_path, backend):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 80, erdos_renyi(80, 90, seed=2))
+    graph = Graph(filePath, backend=backend)
+    output = StringIO()
+
+    graph.bfs_report("1", filePath=output)
+
+    families = []
+    for node, father, level in graph.iter_bfs("1"):
+        if father is None:
+            continue
+        if not families or families[-1][1] != father:
+            families.append((level, father, []))
+        families[-1][2].append(node)
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "Level 0: 1"
+    assert lines[1:] == [
+        f"Level {level}, Father {father}: {' '.join(children)} "
+        for level, father, children in families
+    ]
+    levels = [int(line.split(",")[0].split()[1]) for line in lines[1:]]
+    assert levels == sorted(levels)
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+def test_iterators_respect_max_depth(chain, backend):
+    graph = Graph(chain, backend=backend)
+
+    rows = list(graph.iter_bfs("1", max_depth=2))
+    assert rows == [("1", None, 0), ("2", "1", 1), ("3", "2", 2)]
+    assert [(depth, sorted(level)) for depth, level in graph.iter_bfs_levels("3")] == [
+        (0, ["3"]),
+        (1, ["2", "4", "7"]),
+        (2, ["1", "5"]),
+        (3, ["6"]),
+    ]
+    assert len(list(graph.iter_bfs_levels("3", max_depth=1))) == 2
+    assert list(graph.iter_dfs("3")) == [
+        ("3", None, 0),
+        ("2", "3", 1),
+        ("1", "2", 2),
+        ("4", "3", 1),
+        ("5", "4", 2),
+        ("6", "5", 3),
+        ("7", "3", 1),
+    ]
+    assert list(graph.iter_dfs("3", max_depth=0)) == [("3", None, 0)]
+
+
+@pytest.mark.parametrize("backend", ["dict", "csr"])
+def test_iterators_stop_early(tmp_path, backend):
+    filePath = str(tmp_path / "graph.txt")
+    write_edge_list(filePath, 200, erdos_renyi(200, 400, seed=3))
+    graph = Graph(filePath, backend=backend, profile=True)
+
+    for traversal in (graph.iter_bfs("1"), graph.iter_dfs("1")):
+        first = list(islice(traversal, 5))
+        traversal.close()
+        assert len(first) == 5 and first[0] == ("1", None, 0)
+    levels = graph.iter_bfs_levels("1")
+    assert next(levels) == (0, ["1"])
+    levels.close()
+
+    # Abandoned traversals still flush what they counted
+    assert graph.stats()["counters"]["vertices_popped"] == 10
+    assert graph.bfs("1") == [node for node, _, _ in graph.iter_bfs("1")]
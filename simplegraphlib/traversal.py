@@ -0,0 +1,99 @@
+from collections import deque
+from typing import Callable, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+Neighbors = Callable[[Hashable], Iterable[Hashable]]
+
+
+# Visited marks for dense int vertices, one byte each instead of a set entry
+class VisitedArray:
+    def __init__(self, size: int) -> None:
+        self.marks = bytearray(size)
+
+    def add(self, vertex: int) -> None:
+        self.marks[vertex] = 1
+
+    def __contains__(self, vertex: int) -> bool:
+        return self.marks[vertex] == 1
+
+
+# The iterators below yield (vertex, parent, depth) as vertices are discovered,
+# so callers can stop early just by not consuming the rest
+
+
+def iter_bfs(
+    start: Hashable,
+    neighbors: Neighbors,
+    max_depth: Optional[int] = None,
+    visited=None,
+) -> Iterator[Tuple[Hashable, Optional[Hashable], int]]:
+    visited = set() if visited is None else visited
+    visited.add(start)
+    yield start, None, 0
+
+    queue = deque([(start, 0)])
+    while queue:
+        node, depth = queue.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+
+        for neighbor in neighbors(node):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                yield neighbor, node, depth + 1
+                queue.append((neighbor, depth + 1))
+
+
+def iter_dfs(
+    start: Hashable,
+    neighbors: Neighbors,
+    max_depth: Optional[int] = None,
+    visited=None,
+) -> Iterator[Tuple[Hashable, Optional[Hashable], int]]:
+    visited = set() if visited is None else visited
+    visited.add(start)
+    yield start, None, 0
+
+    # One frame per open vertex, resuming its neighbor iterator like a
+    # recursive call would, so the visit order matches the recursive DFS
+    stack = []
+    if max_depth is None or max_depth > 0:
+        stack.append((start, iter(neighbors(start)), 0))
+    while stack:
+        node, pending, depth = stack[-1]
+        for neighbor in pending:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                yield neighbor, node, depth + 1
+                if max_depth is None or depth + 1 < max_depth:
+                    stack.append((neighbor, iter(neighbors(neighbor)), depth + 1))
+                break
+        else:
+            stack.pop()
+
+
+def iter_bfs_levels(
+    start: Hashable,
+    neighbors: Neighbors,
+    max_depth: Optional[int] = None,
+    visited=None,
+) -> Iterator[Tuple[int, List[Hashable]]]:
+    visited = set() if visited is None else visited
+    visited.add(start)
+    level = [start]
+    depth = 0
+    yield depth, level
+
+    while max_depth is None or depth < max_depth:
+        next_level = []
+        for node in level:
+            for neighbor in neighbors(node):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    next_level.append(neighbor)
+
+        if not next_level:
+            return
+
+        depth += 1
+        level = next_level
+        yield depth, level
@@ -1,116 +1,480 @@
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
 from functools import reduce
-from typing import List, Tuple, Union
+from heapq import heappop, heappush
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 from sys import maxsize
 
-# Only accepts adjacency matrix
+from batch import DistanceMatrix, distance_matrix
+from bellman_ford import NegativeCicleError, batch_bellman_ford, spfa
+from csr import id_typecode
+from degree_stats import DegreeHistogram
+from loader import EdgeRows, is_snapshot, read_snapshot, write_snapshot
+from mst import kruskal, prim
+from point_to_point import astar, bidirectional_dijkstra
+from profiling import NULL_PROFILER, Profiler
+from report import ReportWriter
+from sssp_cache import ShortestPathCache, ShortestPathTree
+
+# Graphs with fewer edges than this fraction of V^2 skip the dense matrix
+SPARSE_DENSITY = 0.25
+
+NEGATIVE_ENGINES = ("spfa", "numpy")
+
+CHANGES = ("add_vertex", "remove_vertex", "add_edge", "remove_edge")
+
+# Point-to-point starts remembered to spot the ones worth a cached tree
+RECENT_STARTS = 1024
+
+
 class WeightedGraph:
-    def __init__(self, filePath: str) -> None:
-        lines = list()
-        with open(filePath, "r") as file:
-            lines = file.readlines()
-
-        self.graph, self.vertices = self.__matrix(lines)
-        self.__has_negative_weights = any(
-            weight < 0 for line in self.graph for weight in line
+    def __init__(
+        self,
+        filePath: str,
+        sparse: Optional[bool] = None,
+        negative_engine: str = "spfa",
+        cache_size: int = 16,
+        cache_bytes: Optional[int] = None,
+        profile: bool = False,
+    ) -> None:
+        if negative_engine not in NEGATIVE_ENGINES:
+            raise ValueError(
+                f"Unknown engine {negative_engine!r}, expected one of {NEGATIVE_ENGINES}"
+            )
+
+        self.negative_engine = negative_engine
+        self.profiler = Profiler() if profile else NULL_PROFILER
+        with self.profiler.phase("parse"):
+            if is_snapshot(filePath):
+                self.adjacency, self.vertices = self.__load_snapshot(filePath)
+            else:
+                self.adjacency, self.vertices = self.__adjacency(EdgeRows(filePath))
+        self.number_of_edges = (
+            sum(len(edges) for edges in self.adjacency)
+            + sum(vertex in edges for vertex, edges in enumerate(self.adjacency))
+        ) // 2
+        self.__negative_edges = sum(
+            weight < 0
+            for vertex, edges in enumerate(self.adjacency)
+            for neighbor, weight in edges.items()
+            if vertex <= neighbor
         )
+        self.__degrees = DegreeHistogram(len(edges) for edges in self.adjacency)
+        self.cache = ShortestPathCache(cache_size, cache_bytes)
+        self.__recent_starts: "OrderedDict[int, None]" = OrderedDict()
+
+        if sparse is None:
+            sparse = self.number_of_edges < SPARSE_DENSITY * self.vertices ** 2
+        self.sparse = sparse
+        self.graph = None
+        if not sparse:
+            with self.profiler.phase("matrix_conversion"):
+                self.graph = self.to_matrix()
+
+    @contextmanager
+    def profile(self) -> Iterator[Profiler]:
+        previous = self.profiler
+        self.profiler = Profiler()
+        try:
+            yield self.profiler
+        finally:
+            self.profiler = previous
+
+    def stats(self) -> Dict[str, Dict]:
+        return {**self.profiler.as_dict(), "cache": self.cache.stats()}
+
+    def to_matrix(self) -> List[List[float]]:
+        matrix = [[0 for _ in range(self.vertices)] for _ in range(self.vertices)]
+
+        for vertex, edges in enumerate(self.adjacency):
+            for neighbor, weight in edges.items():
+                matrix[vertex][neighbor] = weight
+
+        return matrix
+
+    def save_snapshot(self, filePath: str) -> None:
+        offsets, targets, weights = self.__csr_arrays()
+        with self.profiler.phase("output"):
+            write_snapshot(
+                filePath,
+                self.vertices,
+                self.number_of_edges,
+                {"offsets": offsets, "targets": targets, "weights": weights},
+            )
 
-    def mst(self) -> None:
-        with open("mst.txt", "w") as file:
+    def distance_matrix(
+        self,
+        sources: Optional[Iterable[int]] = None,
+        targets: Optional[Iterable[int]] = None,
+        workers: Optional[int] = None,
+        dtype: str = "float64",
+        filePath: Optional[str] = None,
+    ) -> DistanceMatrix:
+        vertices = range(1, self.vertices + 1)
+        sources = vertices if sources is None else list(sources)
+        targets = vertices if targets is None else list(targets)
+
+        with self.profiler.phase("distance_matrix"):
+            values = distance_matrix(
+                *self.__csr_arrays(),
+                [vertex - 1 for vertex in sources],
+                None if targets is vertices else [vertex - 1 for vertex in targets],
+                workers,
+                dtype,
+                filePath,
+                negative=self.__negative_edges > 0,
+                profiler=self.profiler,
+            )
 
-            def write_line(text: str = "") -> None:
-                file.write(f"{text}\n")
+        return DistanceMatrix(sources, targets, values)
+
+    def mst(
+        self,
+        algorithm: str = "prim",
+        filePath: Union[str, TextIO] = "mst.txt",
+        format: str = "text",
+    ) -> float:
+        if algorithm == "prim":
+            edges = prim(self.adjacency, self.profiler)
+        elif algorithm == "kruskal":
+            edges = kruskal(
+                self.vertices,
+                (
+                    (vertex, neighbor, weight)
+                    for vertex, neighbors in enumerate(self.adjacency)
+                    for neighbor, weight in neighbors.items()
+                    if vertex < neighbor
+                ),
+                self.profiler,
+            )
+        else:
+            raise ValueError(f"Unknown MST algorithm {algorithm!r}")
 
-            mst = self.__prims()
-            print(mst)
-            print(self.graph)
+        total_weight = 0
 
-            for i in range(1, self.vertices):
-                write_line(f"{mst[i] + 1} {i + 1}")
+        def tree_edges() -> Iterator[Dict]:
+            nonlocal total_weight
+            for parent, vertex, weight in edges:
+                total_weight += weight
+                yield {"parent": parent + 1, "vertex": vertex + 1, "weight": weight}
 
-    def min_distance(self, start: int, end: int) -> float:
-        if self.__has_negative_weights:
-            distances, _ = self.__bellman_ford(start)
-            return distances[end - 1]
+        # Prim and Kruskal yield lazily, so this phase covers both the
+        # algorithm and the output
+        with self.profiler.phase("mst"), ReportWriter(filePath, format) as writer:
+            writer.rows(
+                "edges", tree_edges(), lambda edge: f"{edge['parent']} {edge['vertex']}"
+            )
+            writer.stats("total", {"weight": round(total_weight, 1)}, lambda _: [])
+
+        return round(total_weight, 1)
 
-        distances, _ = self.__dijkstra(start)
-        return distances[end - 1]
+    def min_distance(
+        self,
+        start: int,
+        end: int,
+        heuristic: Optional[Callable[[int, int], float]] = None,
+    ) -> float:
+        return self.__point_to_point(start, end, heuristic)[0]
 
     def min_distances(self, start: int) -> List[float]:
-        if self.__has_negative_weights:
-            distances, _ = self.__bellman_ford(start)
-            return distances
+        return self.__shortest_path_tree(start).distance_list()
+
+    def shortest_path(
+        self,
+        start: int,
+        end: int,
+        heuristic: Optional[Callable[[int, int], float]] = None,
+    ) -> List[int]:
+        return self.__point_to_point(start, end, heuristic)[1]
 
-        distances, _ = self.__dijkstra(start)
-        return distances
+    def shortest_paths(self, start: int) -> List[List[int]]:
+        tree = self.__shortest_path_tree(start)
 
-    def shortest_path(self, start: int, end: int) -> List[int]:
-        path = [end]
-        predecessor = None
+        return [
+            [] if start == vertex else tree.path(vertex)
+            for vertex in range(1, self.vertices + 1)
+        ]
 
-        if self.__has_negative_weights:
-            _, predecessor = self.__bellman_ford(start)
-        else:
-            _, predecessor = self.__dijkstra(start)
+    @property
+    def min_degree(self) -> int:
+        return self.__degrees.min
+
+    @property
+    def max_degree(self) -> int:
+        return self.__degrees.max
+
+    @property
+    def med_degree(self) -> Union[int, float]:
+        return self.__degrees.mean
+
+    @property
+    def median_degree(self) -> Union[int, float]:
+        return self.__degrees.median
+
+    def add_vertex(self) -> int:
+        self.adjacency.append(dict())
+        self.vertices += 1
+        self.__degrees.add(0)
+        if self.graph is not None:
+            for row in self.graph:
+                row.append(0)
+            self.graph.append([0] * self.vertices)
+
+        self.cache.clear()
+        return self.vertices
+
+    # Vertices are matrix indices, so like deleting a row and column, every
+    # vertex after the removed one moves down by one
+    def remove_vertex(self, vertex: int) -> None:
+        self.__check_vertex(vertex)
+
+        for neighbor in list(self.adjacency[vertex - 1]):
+            self.remove_edge(vertex, neighbor + 1)
+
+        del self.adjacency[vertex - 1]
+        self.vertices -= 1
+        self.__degrees.remove(0)
+        for idx, edges in enumerate(self.adjacency):
+            if any(neighbor >= vertex for neighbor in edges):
+                self.adjacency[idx] = {
+                    neighbor - (neighbor >= vertex): weight
+                    for neighbor, weight in edges.items()
+                }
+        if self.graph is not None:
+            del self.graph[vertex - 1]
+            for row in self.graph:
+                del row[vertex - 1]
+
+        self.cache.clear()
+
+    def add_edge(self, vert1: int, vert2: int, weight: float) -> None:
+        if min(vert1, vert2) < 1:
+            raise ValueError(f"Vertices are numbered from 1, got {min(vert1, vert2)}")
+        if weight == 0:
+            if max(vert1, vert2) <= self.vertices:
+                self.remove_edge(vert1, vert2)
+            return
+
+        while max(vert1, vert2) > self.vertices:
+            self.add_vertex()
+
+        self.remove_edge(vert1, vert2)
+        self.__link(vert1, vert2, weight)
+        self.number_of_edges += 1
+        self.__negative_edges += weight < 0
+        self.cache.clear()
+
+    def remove_edge(self, vert1: int, vert2: int) -> None:
+        self.__check_vertex(vert1)
+        self.__check_vertex(vert2)
+        weight = self.adjacency[vert1 - 1].get(vert2 - 1)
+        if weight is None:
+            return
+
+        self.__link(vert1, vert2, 0)
+        self.number_of_edges -= 1
+        self.__negative_edges -= weight < 0
+        self.cache.clear()
+
+    def apply(self, changes: Iterable[Tuple]) -> None:
+        for change, *arguments in changes:
+            if change not in CHANGES:
+                raise ValueError(
+                    f"Unknown change {change!r}, expected one of {CHANGES}"
+                )
+            getattr(self, change)(*arguments)
+
+    def __check_vertex(self, vertex: int) -> None:
+        if not 1 <= vertex <= self.vertices:
+            raise ValueError(f"Vertex {vertex} is not in the graph")
+
+    # A zero weight unlinks, same as an empty matrix cell
+    def __link(self, vert1: int, vert2: int, weight: float) -> None:
+        for vertex, neighbor in {(vert1 - 1, vert2 - 1), (vert2 - 1, vert1 - 1)}:
+            edges = self.adjacency[vertex]
+            degree = len(edges)
+            if weight:
+                edges[neighbor] = weight
+            else:
+                edges.pop(neighbor, None)
+            self.__degrees.move(degree, len(edges))
+
+            if self.graph is not None:
+                self.graph[vertex][neighbor] = weight
+
+    # A one-off start -> end query only explores until both searches meet (or
+    # A* reaches end). Once a start repeats, its whole tree is built and cached
+    # so the queries after it are walks over the predecessors
+    def __point_to_point(
+        self,
+        start: int,
+        end: int,
+        heuristic: Optional[Callable[[int, int], float]],
+    ) -> Tuple[float, List[int]]:
+        tree = self.cache.get(start)
+        if tree is None and (self.__negative_edges or self.__repeated(start)):
+            tree = self.__cache_tree(start)
+        if tree is not None:
+            return tree.distance(end), tree.path(end)
+
+        with self.profiler.phase("relaxation"):
+            if heuristic is None:
+                distance, path = bidirectional_dijkstra(
+                    start - 1, end - 1, self.adjacency, self.profiler
+                )
+            else:
+                distance, path = astar(
+                    start - 1,
+                    end - 1,
+                    self.adjacency,
+                    lambda vertex, goal: heuristic(vertex + 1, goal + 1),
+                    self.profiler,
+                )
 
-        if predecessor == None:
-            return []
+        if not path:
+            return maxsize, [end]
 
-        while True:
-            next_vertex = predecessor[path[-1] - 1]
-            if next_vertex == None:
-                break
+        return distance, [vertex + 1 for vertex in path]
 
-            path.append(next_vertex)
+    # Repeated queries from the same start reuse the cached tree, so a path is
+    # only a walk over its predecessors
+    def __shortest_path_tree(self, start: int) -> ShortestPathTree:
+        tree = self.cache.get(start)
+        if tree is None:
+            tree = self.__cache_tree(start)
 
-        path.reverse()
+        return tree
 
-        return path
+    def __cache_tree(self, start: int) -> ShortestPathTree:
+        with self.profiler.phase("relaxation"):
+            tree = ShortestPathTree(start, *self.__single_source(start))
+        self.cache.put(tree)
 
-    def shortest_paths(self, start: int) -> List[List[int]]:
-        paths = list()
+        return tree
 
-        if self.__has_negative_weights:
-            _, predecessor = self.__bellman_ford(start)
-        else:
-            _, predecessor = self.__dijkstra(start)
+    def __repeated(self, start: int) -> bool:
+        if self.cache.max_entries <= 0:
+            return False
+        if start in self.__recent_starts:
+            del self.__recent_starts[start]
+            return True
 
-        if predecessor == None:
-            return []
+        self.__recent_starts[start] = None
+        if len(self.__recent_starts) > RECENT_STARTS:
+            self.__recent_starts.popitem(last=False)
+        return False
 
-        for i in range(1, self.vertices + 1):
-            if start == i:
-                paths.append([])
-                continue
+    def __single_source(self, start: int) -> Tuple[List[float], List[int]]:
+        if self.__negative_edges:
+            if self.negative_engine == "numpy":
+                return batch_bellman_ford(
+                    *self.__edge_arrays(), self.vertices, start - 1
+                )
+            return spfa(self.adjacency, start - 1, self.profiler)
+
+        if self.sparse:
+            return self.__heap_dijkstra(start)
+        return self.__dijkstra(start)
+
+    def __csr_arrays(self) -> Tuple[array, array, array]:
+        offsets = array("q", [0])
+        targets = array(id_typecode(self.vertices))
+        weights = array("d")
+
+        for edges in self.adjacency:
+            targets.extend(edges.keys())
+            weights.extend(edges.values())
+            offsets.append(len(targets))
+
+        return offsets, targets, weights
+
+    def __edge_arrays(self) -> Tuple[array, array, array]:
+        sources = array(id_typecode(self.vertices))
+        targets = array(id_typecode(self.vertices))
+        weights = array("d")
 
-            paths.append([i])
-            curr_vertex_path = paths[-1]
+        for vertex, edges in enumerate(self.adjacency):
+            sources.extend([vertex] * len(edges))
+            targets.extend(edges.keys())
+            weights.extend(edges.values())
 
-            while True:
-                next_vertex = predecessor[curr_vertex_path[-1] - 1]
-                if next_vertex == None:
-                    break
+        return sources, targets, weights
 
-                curr_vertex_path.append(next_vertex)
+    def __load_snapshot(self, filePath: str) -> Tuple[List[Dict[int, float]], int]:
+        snapshot = read_snapshot(filePath)
+        offsets = snapshot.arrays["offsets"]
+        targets = snapshot.arrays["targets"]
+        weights = snapshot.arrays["weights"]
 
-            curr_vertex_path.reverse()
+        adjacency = [
+            dict(zip(targets[start:end], weights[start:end]))
+            for start, end in zip(offsets, offsets[1:])
+        ]
 
-        return paths
+        return (adjacency, snapshot.vertices)
 
-    def __matrix(self, edge_strings: List[str]) -> Tuple[List[List[float]], int]:
-        vertices = int(edge_strings.pop(0).strip())
-        matrix = [[0 for _ in range(vertices)] for _ in range(vertices)]
+    def __adjacency(self, rows: EdgeRows) -> Tuple[List[Dict[int, float]], int]:
+        vertices = int(rows.header[0])
+        adjacency = [dict() for _ in range(vertices)]
 
-        for edge_string in edge_strings:
-            edge_list = edge_string.strip().split(" ")
+        for edge_list in rows:
             vert1, vert2, weight = (
                 int(edge_list[0]) - 1,
                 int(edge_list[1]) - 1,
                 float(edge_list[2]),
             )
-            matrix[vert1][vert2] = weight
-            matrix[vert2][vert1] = weight
+            # A zero weight means "no edge", same as an empty matrix cell
+            if weight == 0:
+                adjacency[vert1].pop(vert2, None)
+                adjacency[vert2].pop(vert1, None)
+                continue
+
+            adjacency[vert1][vert2] = weight
+            adjacency[vert2][vert1] = weight
+
+        return (adjacency, vertices)
 
-        return (matrix, vertices)
+    def __heap_dijkstra(self, start: int) -> Tuple[List[float], List[int]]:
+        distances = [maxsize] * self.vertices
+        predecessor = [None] * self.vertices
+        visited = bytearray(self.vertices)
+        distances[start - 1] = 0
+        heap = [(0, start - 1)]
+        popped = scanned = relaxations = 0
+
+        while heap:
+            distance, node = heappop(heap)
+            if visited[node]:
+                continue
+            visited[node] = 1
+            popped += 1
+            scanned += len(self.adjacency[node])
+
+            for neighbor, weight in self.adjacency[node].items():
+                testing_value = round(distance + weight, 1)
+
+                if testing_value < distances[neighbor]:
+                    distances[neighbor] = testing_value
+                    predecessor[neighbor] = node + 1
+                    heappush(heap, (testing_value, neighbor))
+                    relaxations += 1
+
+        self.profiler.count("vertices_popped", popped)
+        self.profiler.count("edges_scanned", scanned)
+        self.profiler.count("relaxations", relaxations)
+        self.profiler.count("heap_pushes", relaxations + 1)
+        return distances, predecessor
 
     def __dijkstra(self, start: int) -> Tuple[List[float]]:
         distances = [maxsize] * self.vertices
@@ -142,70 +506,3 @@ class WeightedGraph:
             unvisited.remove(curr_min_node)
 
         return distances, predecessor
-
-    # TODO parar ciclos de 2 vértices
-    def __bellman_ford(self, start: int) -> Tuple[List[float], List[int]]:
-        distances = [maxsize] * self.vertices
-        predecessor = [None] * self.vertices
-        distances[start - 1] = 0
-
-        for _ in range(self.vertices - 1):
-            for node in range(self.vertices):
-                for neighbor in range(self.vertices):
-                    if self.graph[node][neighbor] != 0 and (
-                        distances[neighbor]
-                        > round(distances[node] + self.graph[node][neighbor], 1)
-                    ):
-                        distances[neighbor] = round(
-                            distances[node] + self.graph[node][neighbor], 1
-                        )
-                        predecessor[neighbor] = node + 1
-
-        for node in range(self.vertices):
-            for neighbor in range(self.vertices):
-                if self.graph[node][neighbor] != 0 and (
-                    distances[neighbor]
-                    > round(distances[node] + self.graph[node][neighbor], 1)
-                ):
-                    raise NegativeCicleError
-
-        return distances, predecessor
-
-    def __prims(self):
-        graph = [
-            [maxsize if jx != ix and j == 0 else j for jx, j in enumerate(i)]
-            for ix, i in enumerate(self.graph)
-        ]
-        weight = [maxsize] * self.vertices
-        weight[0] = 0
-        mst = [None] * self.vertices
-        mst[0] = -1
-        visited = [False] * self.vertices
-
-        for _ in range(self.vertices):
-            minIndex = self.__get_minimum_key(weight, visited)
-            visited[minIndex] = True
-
-            for vertex in range(1, self.vertices):
-                if (
-                    visited[vertex] == False
-                    and weight[vertex] > graph[minIndex][vertex]
-                ):
-                    weight[vertex] = graph[minIndex][vertex]
-                    mst[vertex] = minIndex
-
-        return mst
-
-    def __get_minimum_key(self, weight, visited):
-        min = maxsize
-
-        for i in range(self.vertices):
-            if weight[i] < min and visited[i] == False:
-                min = weight[i]
-                minIndex = i
-
-        return minIndex
-
-
-class NegativeCicleError(Exception):
-    pass